@@ -17,12 +17,14 @@ limitations under the License.
 """
 
 import ast
+import copy
+import functools
 import logging
 import os
-from configparser import NoSectionError
+import random
+import string
 from pathlib import Path
 from playwright.sync_api import sync_playwright, Page
-from appium import webdriver as appiumdriver
 from selenium import webdriver
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
@@ -30,6 +32,41 @@ from selenium.webdriver.remote.webdriver import WebDriver
 
 from toolium.driver_wrappers_pool import DriverWrappersPool
 
+# Initial capabilities of each selenium driver
+_CAPABILITIES_TEMPLATES = {
+    'firefox': DesiredCapabilities.FIREFOX,
+    'chrome': DesiredCapabilities.CHROME,
+    'safari': DesiredCapabilities.SAFARI,
+    'opera': DesiredCapabilities.OPERA,
+    'iexplore': DesiredCapabilities.INTERNETEXPLORER,
+    'edge': DesiredCapabilities.EDGE,
+    'phantomjs': DesiredCapabilities.PHANTOMJS,
+}
+_PLAYWRIGHT_CAPABILITIES = {
+    "browserName": "playwright",
+    "version": "1.2.6",
+    "platform": "ANY",
+    "javascriptEnabled": True,
+}
+# Selenium platform names for each platform in driver type
+_PLATFORMS = {
+    'xp': 'XP',
+    'windows_7': 'VISTA',
+    'windows_8': 'WIN8',
+    'windows_10': 'WIN10',
+    'linux': 'LINUX',
+    'android': 'ANDROID',
+    'mac': 'MAC',
+}
+# Config section, chrome option name and log message of chrome experimental options
+_CHROME_EXPERIMENTAL_OPTIONS = (
+    ('ChromePreferences', 'prefs', 'preference'),
+    ('ChromeMobileEmulation', 'mobileEmulation', 'mobile emulation option'),
+)
+# Boolean values allowed in properties
+_BOOLEAN_VALUES = {'true': True, 'True': True, 'false': False, 'False': False}
+_APPIUM_DRIVERS = frozenset(('android', 'ios', 'iphone'))
+
 
 def get_error_message_from_exception(exception):
     """Extract first line of exception message
@@ -43,11 +80,115 @@ def get_error_message_from_exception(exception):
         return ''
 
 
+@functools.lru_cache(maxsize=512)
+def _convert_property_type_cached(value):
+    """Converts the string value in a boolean, integer or string, caching results by raw value
+
+    :param value: string value
+    :returns: boolean, integer or string value
+    """
+    if value in _BOOLEAN_VALUES:
+        formatted_value = _BOOLEAN_VALUES[value]
+    elif value[:1] + value[-1:] in ('{}', '[]'):
+        formatted_value = ast.literal_eval(value)
+    else:
+        try:
+            formatted_value = int(value)
+        except ValueError:
+            formatted_value = value
+    return formatted_value
+
+
+@functools.lru_cache(maxsize=32)
+def _get_geckodriver_log_path(output_directory):
+    """Get geckodriver log path, that is computed only once for each output directory
+
+    :param output_directory: output directory
+    :returns: geckodriver log path
+    """
+    return os.path.join(output_directory, 'geckodriver.log')
+
+
+def _playwright_window_position(logger, width: int, height: int):
+    """Selenium set_window_position/set_window_size replacement for playwright pages
+
+    :param logger: logger instance
+    :param width: window width
+    :param height: window height
+    :returns: dict with window size
+    """
+    logger.debug("Setting window position to %s %s", width, height)
+    return {'width': width, 'height': height}
+    # TODO redirect to playwright's page.set_viewport_size()
+    # if width==0 or height==0:
+    #     width = 1500
+    #     height = 1500
+    #
+    # print ({'width': width, 'height': height})
+    # page.set_viewport_size({'width': width, 'height': height})
+
+
+def _playwright_default_timeout(page, logger, timeout: int) -> None:
+    """Selenium implicitly_wait replacement for playwright pages
+
+    :param page: playwright page
+    :param logger: logger instance
+    :param timeout: default timeout
+    """
+    logger.debug("Setting default timeout to %s", timeout)
+    page.set_default_timeout(float(timeout))
+
+
+def _playwright_screenshot(page, logger, filepath: str | Path) -> bytes:
+    """Selenium get_screenshot_as_file replacement for playwright pages
+
+    :param page: playwright page
+    :param logger: logger instance
+    :param filepath: screenshot file path
+    :returns: screenshot bytes
+    """
+    logger.debug("Taking shot for %s", filepath)
+    return page.screenshot(path=filepath)
+
+
+def _deep_merge(initial, update):
+    """Update a initial dict with another dict values recursively, using a stack instead of recursive calls
+
+    :param initial: initial dict to be updated
+    :param update: new dict
+    :returns: merged dict
+    """
+    pending = [(initial, update)]
+    while pending:
+        initial_dict, update_dict = pending.pop()
+        for key, value in update_dict.items():
+            if isinstance(value, dict):
+                if not isinstance(initial_dict.get(key), dict):
+                    initial_dict[key] = {}
+                pending.append((initial_dict[key], value))
+            else:
+                initial_dict[key] = value
+    return initial
+
+
 class ConfigDriver(object):
+    # Setup method names of each local driver
+    _local_driver_setups = {
+        'firefox': '_setup_firefox',
+        'chrome': '_setup_chrome',
+        'safari': '_setup_safari',
+        'opera': '_setup_opera',
+        'iexplore': '_setup_explorer',
+        'edge': '_setup_edge',
+        'phantomjs': '_setup_phantomjs',
+        'playwright': '_setup_playwright',
+    }
+
     def __init__(self, config, utils=None):
         self.logger = logging.getLogger(__name__)
         self.config = config
         self.utils = utils
+        self._driver_type = None
 
     def create_driver(self) -> WebDriver | Page:
         """Create a selenium driver using specified config properties
@@ -55,7 +196,7 @@ class ConfigDriver(object):
         :returns: a new selenium driver
         :rtype: selenium.webdriver.remote.webdriver.WebDriver
         """
-        driver_type = self.config.get('Driver', 'type')
+        driver_type = self._driver_type = self.config.get('Driver', 'type')
         try:
             if self.config.getboolean_optional('Server', 'enabled'):
                 self.logger.info("Creating remote driver (type = %s)", driver_type)
@@ -77,14 +218,14 @@ class ConfigDriver(object):
         :returns: a new remote selenium driver
         """
         # Get server url
-        server_url = '{}/wd/hub'.format(self.utils.get_server_url())
+        server_url = f'{self.utils.get_server_url()}/wd/hub'
 
         # Get driver capabilities
         driver_name = self.utils.get_driver_name()
         capabilities = self._get_capabilities_from_driver_type(driver_name)
 
         # Add version and platform capabilities
-        self._add_capabilities_from_driver_type(capabilities)
+        self._add_capabilities_from_driver_type(capabilities, self._driver_type)
 
         if driver_name == 'opera':
             capabilities['opera.autostart'] = True
@@ -98,13 +239,14 @@ class ConfigDriver(object):
         if driver_name == 'chrome':
             self._add_chrome_options_to_capabilities(capabilities)
 
-        if driver_name in ('android', 'ios', 'iphone'):
+        if driver_name in _APPIUM_DRIVERS:
             # Create remote appium driver
+            from appium import webdriver as appiumdriver
             self._add_capabilities_from_properties(capabilities, 'AppiumCapabilities')
-            return appiumdriver.Remote(command_executor=server_url, desired_capabilities=capabilities)
+            return appiumdriver.Remote(command_executor=server_url, desired_capabilities=capabilities, keep_alive=True)
         else:
-            # Create remote web driver
-            return webdriver.Remote(command_executor=server_url, desired_capabilities=capabilities)
+            # Create remote web driver, reusing the HTTP connection to the server for all commands
+            return webdriver.Remote(command_executor=server_url, desired_capabilities=capabilities, keep_alive=True)
 
     def _create_local_driver(self):
         """Create a driver in local machine
@@ -113,24 +255,14 @@ class ConfigDriver(object):
         """
         driver_name = self.utils.get_driver_name()
 
-        if driver_name in ('android', 'ios', 'iphone'):
+        if driver_name in _APPIUM_DRIVERS:
             # Create local appium driver
             driver = self._setup_appium()
         else:
-            driver_setup = {
-                'firefox': self._setup_firefox,
-                'chrome': self._setup_chrome,
-                'safari': self._setup_safari,
-                'opera': self._setup_opera,
-                'iexplore': self._setup_explorer,
-                'edge': self._setup_edge,
-                'phantomjs': self._setup_phantomjs,
-                'playwright': self._setup_playwright
-            }
-            try:
-                driver_setup_method = driver_setup[driver_name]
-            except KeyError:
-                raise ValueError('Unknown driver {0}'.format(driver_name))
+            driver_setup_method_name = self._local_driver_setups.get(driver_name)
+            if driver_setup_method_name is None:
+                raise ValueError(f'Unknown driver {driver_name}')
+            driver_setup_method = getattr(self, driver_setup_method_name)
 
             # Get driver capabilities
             capabilities = self._get_capabilities_from_driver_type(driver_name)
@@ -148,56 +280,29 @@ class ConfigDriver(object):
         :params driver_name: name of selected driver
         :returns: capabilities dictionary
         """
-        if driver_name == 'firefox':
-            capabilities = DesiredCapabilities.FIREFOX.copy()
-        elif driver_name == 'chrome':
-            capabilities = DesiredCapabilities.CHROME.copy()
-        elif driver_name == 'safari':
-            capabilities = DesiredCapabilities.SAFARI.copy()
-        elif driver_name == 'opera':
-            capabilities = DesiredCapabilities.OPERA.copy()
-        elif driver_name == 'iexplore':
-            capabilities = DesiredCapabilities.INTERNETEXPLORER.copy()
-        elif driver_name == 'edge':
-            capabilities = DesiredCapabilities.EDGE.copy()
-        elif driver_name == 'phantomjs':
-            capabilities = DesiredCapabilities.PHANTOMJS.copy()
-        elif driver_name == 'playwright':
-            print("Setting playwright capabilities")
-            capabilities = {
-                "browserName": "playwright",
-                "version": "1.2.6",
-                "platform": "ANY",
-                "javascriptEnabled": True,
-            }
-        elif driver_name in ('android', 'ios', 'iphone'):
-            capabilities = {}
-        else:
-            raise ValueError('Unknown driver {0}'.format(driver_name))
-        return capabilities
-
-    def _add_capabilities_from_driver_type(self, capabilities):
+        capabilities = _CAPABILITIES_TEMPLATES.get(driver_name)
+        if capabilities is not None:
+            return capabilities.copy()
+        if driver_name == 'playwright':
+            logging.getLogger(__name__).debug("Setting playwright capabilities")
+            return _PLAYWRIGHT_CAPABILITIES.copy()
+        if driver_name in _APPIUM_DRIVERS:
+            return {}
+        raise ValueError(f'Unknown driver {driver_name}')
+
+    def _add_capabilities_from_driver_type(self, capabilities, driver_type=None):
         """Extract version and platform from driver type and add them to capabilities
 
         :param capabilities: capabilities dict
+        :param driver_type: driver type, if it has been already read from config
         """
-        driver_type = self.config.get('Driver', 'type')
-        try:
-            capabilities['version'] = driver_type.split('-')[1]
-        except IndexError:
-            pass
-
-        try:
-            platforms_list = {'xp': 'XP',
-                              'windows_7': 'VISTA',
-                              'windows_8': 'WIN8',
-                              'windows_10': 'WIN10',
-                              'linux': 'LINUX',
-                              'android': 'ANDROID',
-                              'mac': 'MAC'}
-            capabilities['platform'] = platforms_list.get(driver_type.split('-')[3], driver_type.split('-')[3])
-        except IndexError:
-            pass
+        if driver_type is None:
+            driver_type = self.config.get('Driver', 'type')
+        driver_type_parts = driver_type.split('-')
+        if len(driver_type_parts) > 1:
+            capabilities['version'] = driver_type_parts[1]
+        if len(driver_type_parts) > 3:
+            capabilities['platform'] = _PLATFORMS.get(driver_type_parts[3], driver_type_parts[3])
 
     def _add_capabilities_from_properties(self, capabilities, section):
         """Add capabilities from properties file
@@ -205,14 +310,29 @@ class ConfigDriver(object):
         :param capabilities: capabilities object
         :param section: properties section
         """
+        if not self.config.has_section(section):
+            return
         cap_type = {'Capabilities': 'server', 'AppiumCapabilities': 'Appium server'}
-        try:
-            for cap, cap_value in dict(self.config.items(section)).items():
-                self.logger.debug("Added %s capability: %s = %s", cap_type[section], cap, cap_value)
-                cap_value = cap_value if cap == 'version' else self._convert_property_type(cap_value)
-                self._update_dict(capabilities, {cap: cap_value}, initial_key=cap)
-        except NoSectionError:
-            pass
+        for cap, cap_value in self._get_section_items(section).items():
+            self.logger.debug("Added %s capability: %s = %s", cap_type[section], cap, cap_value)
+            cap_value = cap_value if cap == 'version' else self._convert_property_type(cap_value)
+            self._update_dict(capabilities, {cap: cap_value}, initial_key=cap)
+
+    def _get_section_items(self, section):
+        """Get options and values of a config section, reusing the parsed section if config has not changed
+
+        :param section: config section
+        :returns: dict with section options and values
+        """
+        return self.config.get_section_items(section)
+
+    def _get_optional_section_items(self, section):
+        """Get options and values of a config section, or an empty dict if section does not exist
+
+        :param section: config section
+        :returns: dict with section options and values
+        """
+        return self._get_section_items(section) if self.config.has_section(section) else {}
 
     def _setup_firefox(self, capabilities):
         """Setup Firefox webdriver
@@ -240,7 +360,7 @@ class ConfigDriver(object):
         if firefox_binary:
             firefox_options.binary = firefox_binary
 
-        log_path = os.path.join(DriverWrappersPool.output_directory, 'geckodriver.log')
+        log_path = _get_geckodriver_log_path(DriverWrappersPool.output_directory)
         try:
             # Selenium 3
             return webdriver.Firefox(firefox_profile=self._create_firefox_profile(), capabilities=capabilities,
@@ -255,13 +375,12 @@ class ConfigDriver(object):
 
         :param options: Firefox options object
         """
-        try:
-            for pref, pref_value in dict(self.config.items('FirefoxArguments')).items():
-                pref_value = '={}'.format(pref_value) if pref_value else ''
-                self.logger.debug("Added Firefox argument: %s%s", pref, pref_value)
-                options.add_argument('{}{}'.format(pref, self._convert_property_type(pref_value)))
-        except NoSectionError:
-            pass
+        if not self.config.has_section('FirefoxArguments'):
+            return
+        for pref, pref_value in self._get_section_items('FirefoxArguments').items():
+            pref_value = f'={pref_value}' if pref_value else ''
+            self.logger.debug("Added Firefox argument: %s%s", pref, pref_value)
+            options.add_argument(f'{pref}{self._convert_property_type(pref_value)}')
 
     def _create_firefox_profile(self):
         """Create and configure a firefox profile
@@ -277,22 +396,20 @@ class ConfigDriver(object):
         profile = webdriver.FirefoxProfile(profile_directory=profile_directory)
         profile.native_events_enabled = True
 
+        preferences = self._get_optional_section_items('FirefoxPreferences')
+        extensions = self._get_optional_section_items('FirefoxExtensions')
+
         # Add Firefox preferences
-        try:
-            for pref, pref_value in dict(self.config.items('FirefoxPreferences')).items():
+        if preferences:
+            for pref, pref_value in preferences.items():
                 self.logger.debug("Added firefox preference: %s = %s", pref, pref_value)
                 profile.set_preference(pref, self._convert_property_type(pref_value))
             profile.update_preferences()
-        except NoSectionError:
-            pass
 
         # Add Firefox extensions
-        try:
-            for pref, pref_value in dict(self.config.items('FirefoxExtensions')).items():
-                self.logger.debug("Added firefox extension: %s = %s", pref, pref_value)
-                profile.add_extension(pref_value)
-        except NoSectionError:
-            pass
+        for pref, pref_value in extensions.items():
+            self.logger.debug("Added firefox extension: %s = %s", pref, pref_value)
+            profile.add_extension(pref_value)
 
         return profile
 
@@ -303,19 +420,9 @@ class ConfigDriver(object):
         :param value: string value
         :returns: boolean, integer or string value
         """
-        if value in ('true', 'True'):
-            formatted_value = True
-        elif value in ('false', 'False'):
-            formatted_value = False
-        elif ((str(value).startswith('{') and str(value).endswith('}'))
-              or (str(value).startswith('[') and str(value).endswith(']'))):
-            formatted_value = ast.literal_eval(value)
-        else:
-            try:
-                formatted_value = int(value)
-            except ValueError:
-                formatted_value = value
-        return formatted_value
+        formatted_value = _convert_property_type_cached(value)
+        # Cached dicts and lists are copied to avoid sharing mutable values between drivers
+        return copy.deepcopy(formatted_value) if isinstance(formatted_value, (dict, list)) else formatted_value
 
     def _setup_chrome(self, capabilities):
         """Setup Chrome webdriver
@@ -349,57 +456,63 @@ class ConfigDriver(object):
             options.binary_location = chrome_binary
 
         # Add Chrome preferences, mobile emulation options and chrome arguments
-        self._add_chrome_options(options, 'prefs')
-        self._add_chrome_options(options, 'mobileEmulation')
+        self._add_chrome_options(options)
         self._add_chrome_arguments(options)
 
         return options
 
-    def _add_chrome_options(self, options, option_name):
-        """Add Chrome options from properties file
+    def _add_chrome_options(self, options):
+        """Add Chrome preferences and mobile emulation options from properties file
 
         :param options: chrome options object
-        :param option_name: chrome option name
         """
-        options_conf = {'prefs': {'section': 'ChromePreferences', 'message': 'preference'},
-                        'mobileEmulation': {'section': 'ChromeMobileEmulation', 'message': 'mobile emulation option'}}
-        option_value = dict()
-        try:
-            for key, value in dict(self.config.items(options_conf[option_name]['section'])).items():
-                self.logger.debug("Added chrome %s: %s = %s", options_conf[option_name]['message'], key, value)
+        for section, option_name, message in _CHROME_EXPERIMENTAL_OPTIONS:
+            if not self.config.has_section(section):
+                continue
+            option_value = dict()
+            for key, value in self._get_section_items(section).items():
+                self.logger.debug("Added chrome %s: %s = %s", message, key, value)
                 option_value[key] = self._convert_property_type(value)
             if len(option_value) > 0:
                 options.add_experimental_option(option_name, option_value)
-        except NoSectionError:
-            pass
 
     def _add_chrome_arguments(self, options):
         """Add Chrome arguments from properties file
 
         :param options: chrome options object
         """
-        try:
-            for pref, pref_value in dict(self.config.items('ChromeArguments')).items():
-                pref_value = '={}'.format(pref_value) if pref_value else ''
-                self.logger.debug("Added chrome argument: %s%s", pref, pref_value)
-                options.add_argument('{}{}'.format(pref, self._convert_property_type(pref_value)))
-        except NoSectionError:
-            pass
+        if not self.config.has_section('ChromeArguments'):
+            return
+        for pref, pref_value in self._get_section_items('ChromeArguments').items():
+            pref_value = f'={pref_value}' if pref_value else ''
+            self.logger.debug("Added chrome argument: %s%s", pref, pref_value)
+            options.add_argument(f'{pref}{self._convert_property_type(pref_value)}')
 
     def _add_chrome_options_to_capabilities(self, capabilities):
         """Add Chrome options to capabilities
 
         :param capabilities: dictionary with driver capabilities
         """
-        chrome_capabilities = self._create_chrome_options().to_capabilities()
-        options_key = None
-        if 'goog:chromeOptions' in chrome_capabilities:
-            options_key = 'goog:chromeOptions'
-        elif 'chromeOptions' in chrome_capabilities:
+        chrome_capabilities = self._get_chrome_capabilities()
+        options_key = 'goog:chromeOptions'
+        chrome_options = chrome_capabilities.get(options_key)
+        if chrome_options is None:
             # Selenium 3.5.3 and older
             options_key = 'chromeOptions'
-        if options_key:
-            self._update_dict(capabilities, chrome_capabilities, initial_key=options_key)
+            chrome_options = chrome_capabilities.get(options_key)
+        if chrome_options is not None:
+            # Merge only chrome options, without iterating over the rest of chrome capabilities
+            _deep_merge(capabilities, {options_key: chrome_options})
+
+    def _get_chrome_capabilities(self):
+        """Get capabilities from chrome options, that are only created again if config has been modified
+        They are cached in config object, as a new ConfigDriver is created for each driver
+
+        :returns: dictionary with chrome capabilities
+        """
+        chrome_capabilities = self.config.get_cached_value('chrome_capabilities',
+                                                           lambda: self._create_chrome_options().to_capabilities())
+        return copy.deepcopy(chrome_capabilities)
 
     def _update_dict(self, initial, update, initial_key=None):
         """ Update a initial dict with another dict values recursively
@@ -409,9 +522,10 @@ class ConfigDriver(object):
         :param initial_key: update only one key in initial dicts
         :return: merged dict
         """
-        for key, value in update.items():
-            if initial_key is None or key == initial_key:
-                initial[key] = self._update_dict(initial.get(key, {}), value) if isinstance(value, dict) else value
+        if initial_key is None:
+            return _deep_merge(initial, update)
+        if initial_key in update:
+            _deep_merge(initial, {initial_key: update[initial_key]})
         return initial
 
     def _setup_safari(self, capabilities):
@@ -487,48 +601,22 @@ class ConfigDriver(object):
 
         page.desired_capabilities = {'platform': 'playwright', 'browser': browser.browser}
 
-        def generate_fake_sessionid(length: int) -> str:
-            import random
-            import string
-            session_id = ''
-            for _data in range(length):
-                session_id += random.choice(string.ascii_letters)
-            return session_id
-
-        page.session_id = generate_fake_sessionid(40)
-
-        def window_position(width: int, height: int):
-            self.logger.debug("Setting window position to " + str(width) + " " + str(height))
-            return {'width': width, 'height': height}
-            # TODO redirect to playwright's page.set_viewport_size()
-            # if width==0 or height==0:
-            #     width = 1500
-            #     height = 1500
-            #
-            # print ({'width': width, 'height': height})
-            # page.set_viewport_size({'width': width, 'height': height})
-
-        def default_time(timeout: int) -> None:
-            self.logger.debug("Setting default timeout to " + str(timeout))
-            page.set_default_timeout(float(timeout))
-
-        def get_page_screenshot(filepath: str | Path) -> bytes:
-            self.logger.debug("Taking shot for " + filepath)
-            return page.screenshot(path=filepath)
+        page.session_id = ''.join(random.choices(string.ascii_letters, k=40))
 
         # redirect selenium methods
+        window_position = functools.partial(_playwright_window_position, self.logger)
         page.set_window_position = window_position
         page.set_window_size = window_position
-        page.maximize_window = lambda: window_position(1500, 1500)
+        page.maximize_window = functools.partial(window_position, 1500, 1500)
         page.get_window_size = page.maximize_window
         page.get = page.goto
         page.execute_script = page.evaluate
         page.refresh = page.reload
         page.get_cookies = page.context.cookies()
         page.delete_all_cookies = page.context.clear_cookies
-        page.implicitly_wait = default_time
+        page.implicitly_wait = functools.partial(_playwright_default_timeout, page, self.logger)
         page.close = page.maximize_window
-        page.get_screenshot_as_file = get_page_screenshot
+        page.get_screenshot_as_file = functools.partial(_playwright_screenshot, page, self.logger)
 
         # TODO Server and Client Logs
 
@@ -25,6 +25,13 @@ logger = logging.getLogger(__name__)
 
 
 class ExtendedConfigParser(ConfigParser):
+    def __init__(self, *args, **kwargs):
+        # Cache attributes must exist before parent init, that could already set default values
+        self._version = 0
+        self._section_items_cache = {}
+        self._values_cache = {}
+        super().__init__(*args, **kwargs)
+
     def optionxform(self, optionstr):
         """Override default optionxform in ConfigParser to allow case sensitive options"""
         return optionstr
@@ -171,6 +178,61 @@ class ExtendedConfigParser(ConfigParser):
 
         return config
 
+    @property
+    def version(self):
+        """Config version, that is incremented each time config is modified
+
+        :returns: config version number
+        """
+        return self._version
+
+    def get_section_items(self, section):
+        """Get a dict with all options and values of a section
+        Result is cached until config is modified, to avoid parsing the same section in each driver creation
+
+        :param section: config section
+        :returns: new dict with section options and values, that can be modified without changing the cache
+        """
+        try:
+            section_items = self._section_items_cache[section]
+        except KeyError:
+            section_items = dict(self.items(section))
+            self._section_items_cache[section] = section_items
+        return dict(section_items)
+
+    def get_cached_value(self, key, create_value):
+        """Get a value created from config properties
+        Result is cached until config is modified, to avoid creating it again in each driver creation
+
+        :param key: key of the cached value
+        :param create_value: function without arguments to create the value if it is not cached
+        :returns: cached value
+        """
+        try:
+            return self._values_cache[key]
+        except KeyError:
+            value = create_value()
+            self._values_cache[key] = value
+            return value
+
+    def _invalidate_cache(self):
+        """Increment config version and remove cached sections and values after config is modified"""
+        self._version += 1
+        self._section_items_cache.clear()
+        self._values_cache.clear()
+
+    def _read(self, *args, **kwargs):
+        super()._read(*args, **kwargs)
+        self._invalidate_cache()
+
+    def add_section(self, section):
+        super().add_section(section)
+        self._invalidate_cache()
+
+    def remove_section(self, section):
+        self._invalidate_cache()
+        return super().remove_section(section)
+
     # Overwrite ConfigParser methods to allow colon in options names
     # To set a config property with colon in name
     #    goog:loggingPrefs = "{'performance': 'ALL', 'browser': 'ALL', 'driver': 'ALL'}"
@@ -188,6 +250,7 @@ class ExtendedConfigParser(ConfigParser):
 
     def set(self, section, option, *args):
         super().set(section, self._encode_option(option), *args)
+        self._invalidate_cache()
 
     def options(self, section):
         return [self._decode_option(option) for option in super().options(section)]
@@ -196,6 +259,7 @@ class ExtendedConfigParser(ConfigParser):
         return super().has_option(section, self._encode_option(option))
 
     def remove_option(self, section, option):
+        self._invalidate_cache()
         return super().remove_option(section, self._encode_option(option))
 
     def items(self, *args):
@@ -17,20 +17,22 @@ limitations under the License.
 """
 import logging
 import os
-import re
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from os import path
 from jira import JIRA, Issue
+from requests.adapters import DEFAULT_POOLSIZE
 from toolium.config_driver import get_error_message_from_exception
 from toolium.driver_wrappers_pool import DriverWrappersPool
 
 logger = logging.getLogger(__name__)
+_server_logger = logging.getLogger("Jira.Server")
+_query_logger = logging.getLogger("Jira.Queries")
 
 
 class JiraServer:
 
     def __init__(self, execution_url, token=None):
-        global logger
-        logger = logging.getLogger("Jira.Server")
         self.url = execution_url
         self._token = token
         self.server: JIRA = None
@@ -39,13 +41,13 @@ class JiraServer:
         server_url = self.url
         headers = JIRA.DEFAULT_OPTIONS["headers"]
         headers["Authorization"] = f"Bearer {self._token}"
-        logger.info("Starting Jira server...")
+        _server_logger.info("Starting Jira server...")
         self.server = JIRA(server=server_url, options={"headers": headers, 'verify': True}, get_server_info=True)
         return self.server
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.server.close()
-        logger.info("Jira server closed//")
+        _server_logger.info("Jira server closed//")
 
 
 # Dict to save tuples with jira keys, their test status, comments and attachments
@@ -54,6 +56,9 @@ jira_tests_status = {}
 # List to save temporary test attachments
 attachments = []
 
+# Default number of test cases updated in parallel
+DEFAULT_MAX_WORKERS = 5
+
 # Jira configuration
 enabled = None
 jiratoken = None
@@ -65,6 +70,16 @@ comments = None
 fix_version = None
 build = None
 only_if_changes = None
+max_workers = DEFAULT_MAX_WORKERS
+
+# Config object and version from which Jira configuration was read
+_jira_conf_source = None
+
+# Max number of threads used to upload attachments of each test case
+ATTACHMENT_WORKERS = 4
+
+# Transition ids by lowercase transition name, read once for each (project key, lowercase current status)
+_transitions_cache = {}
 
 
 def jira(test_key):
@@ -93,13 +108,19 @@ def jira(test_key):
 
 
 def save_jira_conf():
-    """Read Jira configuration from properties file and save it"""
+    """Read Jira configuration from properties file and save it
+    Configuration is only read again if config object has changed or has been modified
+    """
     global enabled, jiratoken, project_id, execution_url, summary_prefix, labels, comments,\
-        fix_version, build, only_if_changes, attachments
+        fix_version, build, only_if_changes, max_workers, attachments, _jira_conf_source
     config = DriverWrappersPool.get_default_wrapper().config
+    attachments = []
+    if _jira_conf_source is not None and _jira_conf_source[0] is config and _jira_conf_source[1] == config.version:
+        return
+    _jira_conf_source = (config, config.version)
     enabled = config.getboolean_optional('Jira', 'enabled')
     jiratoken = config.get_optional('Jira', 'token')
-    project_id = int(config.get_optional('Jira', 'project_id'))
+    project_id = int(config.get_optional('Jira', 'project_id', 0))
     execution_url = config.get_optional('Jira', 'execution_url')
     summary_prefix = config.get_optional('Jira', 'summary_prefix')
     labels = config.get_optional('Jira', 'labels')
@@ -107,11 +128,27 @@ def save_jira_conf():
     fix_version = config.get_optional('Jira', 'fixversion')
     build = config.get_optional('Jira', 'build')
     only_if_changes = config.getboolean_optional('Jira', 'onlyifchanges')
-    attachments = []
+    max_workers = int(config.get_optional('Jira', 'max_workers', DEFAULT_MAX_WORKERS))
+    if max_workers < 1:
+        logger.warning("Invalid Jira max_workers value %s, using %s", max_workers, DEFAULT_MAX_WORKERS)
+        max_workers = DEFAULT_MAX_WORKERS
     jira_properties = {"enabled": enabled, "execution_url": execution_url, "summary_prefix": summary_prefix,
                        "labels": labels, "comments": comments, "fix_version": fix_version, "build": build,
-                       "only_if_changes": only_if_changes, "attachments": attachments}
-    logger.debug("Jira properties read:" + jira_properties.__str__())
+                       "only_if_changes": only_if_changes, "max_workers": max_workers, "attachments": attachments}
+    logger.debug("Jira properties read: %r", jira_properties)
+
+
+def reload_jira_conf():
+    """Read Jira configuration again, even if config has not been modified"""
+    invalidate()
+    save_jira_conf()
+
+
+def invalidate():
+    """Forget the cached Jira configuration, so that it is read again in the next test"""
+    global _jira_conf_source
+    _jira_conf_source = None
+    _transitions_cache.clear()
 
 
 def add_attachment(attachment):
@@ -121,7 +158,7 @@ def add_attachment(attachment):
     """
     if attachment:
         attachments.append(attachment)
-        logger.info("Attachement Added from: " + attachment)
+        logger.info("Attachement Added from: %s", attachment)
 
 
 def add_jira_status(test_key, test_status, test_comment):
@@ -131,29 +168,45 @@ def add_jira_status(test_key, test_status, test_comment):
     :param test_status: test case status
     :param test_comment: test case comments
     """
-    global attachments
     if test_key and enabled:
+        # Copy attachments to avoid sharing the same list between test cases
+        test_attachments = list(attachments)
         if test_key in jira_tests_status:
             # Merge data with previous test status
             previous_status = jira_tests_status[test_key]
-            logger.debug("Found previous data for " + test_key.__str__())
+            logger.debug("Found previous data for %s", test_key)
 
             test_status = 'Pass' if previous_status[1] == 'Pass' and test_status == 'Pass' else 'Fail'
             if previous_status[2] and test_comment:
                 test_comment = '{}\n{}'.format(previous_status[2], test_comment)
             elif previous_status[2] and not test_comment:
                 test_comment = previous_status[2]
-            attachments += previous_status[3]
+            # Merge previous attachments removing duplicated paths, but keeping their order
+            test_attachments = list(dict.fromkeys(previous_status[3] + test_attachments))
         # Add or update test status
-        jira_tests_status[test_key] = (test_key, test_status, test_comment, attachments)
+        jira_tests_status[test_key] = (test_key, test_status, test_comment, test_attachments)
     elif enabled and not test_key:
         logger.error("Status not updated, invalid test key")
 
 
 def change_all_jira_status():
-    """Iterate over all jira test cases, update their status in Jira and clear the dictionary"""
-    for test_status in jira_tests_status.values():
-        change_jira_status(*test_status)
+    """Iterate over all jira test cases, update their status in Jira and clear the dictionary
+    Test cases are updated in parallel, using up to max_workers threads that share the same Jira session
+    """
+    # Jira session is not opened if there is nothing to update or execution_url is not configured
+    jira_session = JiraServer(execution_url, jiratoken) if jira_tests_status and execution_url else nullcontext()
+    try:
+        with jira_session as server:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(change_jira_status, *test_status, server=server)
+                           for test_status in jira_tests_status.values()]
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error("Exception while updating Jira: %s", e)
+    except Exception as e:
+        logger.error("Exception while connecting to Jira: %s", e)
     jira_tests_status.clear()
     if enabled:
         logger.debug("Update attempt complete, clearing queue")
@@ -161,13 +214,23 @@ def change_all_jira_status():
         logger.debug("Jira disabled, upload skipped")
 
 
-def change_jira_status(test_key, test_status, test_comment, test_attachments: list[str]):
+def get_attachment_workers():
+    """Get the number of threads used to upload attachments of each test case, so that the threads of all test cases
+    updated in parallel do not exceed the connection pool size of the shared Jira session
+
+    :returns: number of attachment threads
+    """
+    return max(1, min(ATTACHMENT_WORKERS, DEFAULT_POOLSIZE // max_workers))
+
+
+def change_jira_status(test_key, test_status, test_comment, test_attachments: list[str], server: JIRA = None):
     """Update test status in Jira
 
     :param test_key: test case key in Jira
     :param test_status: test case status
     :param test_comment: test case comments
     :param test_attachments: list of absolutes paths of test case attachment files
+    :param server: opened Jira session, a new session is opened if it is None
     """
 
     if not execution_url:
@@ -175,54 +238,55 @@ def change_jira_status(test_key, test_status, test_comment, test_attachments: li
         return
 
     logger.info("Updating Test Case '%s' in Jira with status %s", test_key, test_status)
-    composed_comments = comments
-    if test_comment:
-        composed_comments = '{}\n{}'.format(comments, test_comment) if comments else test_comment
-    payload = {'jiraTestCaseId': test_key, 'jiraStatus': test_status, 'summaryPrefix': summary_prefix,
-               'labels': labels, 'comments': composed_comments, 'version': fix_version, 'build': build}
-    if only_if_changes:
-        payload['onlyIfStatusChanges'] = 'true'
     try:
-        with JiraServer(execution_url, jiratoken) as server:
-            existing_issues = execute_query(server, 'issue = ' + test_key)
-            if not existing_issues:
-                logger.warning("Jira Issue not found,...")
-                return
-                # TODO issue = new_testcase(server, project_id, summary=scenarioname, description=description)
-                # test_key = issue.key
+        if server is None:
+            with JiraServer(execution_url, jiratoken) as server:
+                update_jira_issue(server, test_key, test_status, test_attachments)
+        else:
+            update_jira_issue(server, test_key, test_status, test_attachments)
+    except Exception as e:
+        logger.error("Exception while updating Issue '%s': %s", test_key, e)
+        return
 
-            # TODO enforce test case as issue type and call create_test_execution for each scenario as below
-            #  new_execution = create_test_execution(server,test_key, project_id)
 
-            logger.info("Retrieving " + test_key)
-            issue = server.issue(test_key)
+def update_jira_issue(server: JIRA, test_key, test_status, test_attachments: list[str]):
+    """Update test issue in Jira using an opened Jira session
 
-            # TODO massage payload, labels??
-            logger.debug("Update skipped for " + test_key)
-            # issue.update(fields=payload, jira=server)
+    :param server: opened Jira session
+    :param test_key: test case key in Jira
+    :param test_status: test case status
+    :param test_attachments: list of absolutes paths of test case attachment files
+    """
+    existing_issues = execute_query(server, 'issue = ' + test_key)
+    if not existing_issues:
+        logger.warning("Jira Issue not found,...")
+        return
+        # TODO issue = new_testcase(server, project_id, summary=scenarioname, description=description)
+        # test_key = issue.key
 
-            # TODO wait to create test execution before transitioning to behave status
-            logger.debug("Transition skipped for " + test_key)
-            # transition(server, issue, test_status)
+    # TODO enforce test case as issue type and call create_test_execution for each scenario as below
+    #  new_execution = create_test_execution(server,test_key, project_id)
 
-            add_results(server, issue.key, test_attachments)
+    # Reuse the issue returned by the search instead of retrieving it again
+    issue = existing_issues[0]
 
-    except Exception as e:
-        logger.error("Exception while updating Issue '%s': %s", test_key, e)
-        return
+    # TODO massage payload, labels??
+    logger.debug("Update skipped for %s", test_key)
 
+    # TODO wait to create test execution before transitioning to behave status
+    logger.debug("Transition skipped for %s", test_key)
+    # transition(server, issue, test_status)
 
-def execute_query(jira: JIRA, query: str):
-    logger = logging.getLogger("Jira.Queries")
+    add_results(server, issue.key, test_attachments)
 
-    logger.info(f"executing query: {query} ...\n")
+
+def execute_query(jira: JIRA, query: str):
+    _query_logger.info("executing query: %s ...\n", query)
     existing_issues = jira.search_issues(query)
 
-    issuesfound = ""
-    for issue in existing_issues:
-        issuesfound += f'\n{issue} {jira.issue(issue).fields.summary}'
-    if issuesfound:
-        logger.info("Found issue/s:" + issuesfound)
+    if existing_issues and _query_logger.isEnabledFor(logging.INFO):
+        issues_found = ''.join(f'\n{issue} {issue.fields.summary}' for issue in existing_issues)
+        _query_logger.info("Found issue/s:%s", issues_found)
     return existing_issues
 
 
@@ -244,72 +308,105 @@ def transition(server: JIRA, issue: Issue, test_status: str):
     Transitions the issue to a new state, see issue workflows in the project for available options
     param test_status: the new status of the issue
     """
-    logger.info("Setting new status for " + issue.key + "from " + issue.get_field("status") + " to " + test_status)
-    response = server.transition_issue(issue.key, transition=test_status.lower())
+    current_status = str(issue.get_field("status"))
+    logger.info("Setting new status for %s from %s to %s", issue.key, current_status, test_status)
+    transition_id = get_transition_id(server, issue.key, current_status, test_status)
+    if transition_id is None:
+        logger.warning("Transition '%s' not found for Test Case '%s', resolving it by name", test_status, issue.key)
+        transition_id = test_status.lower()
+    response = server.transition_issue(issue.key, transition=transition_id)
     if response.status_code >= 400:
         logger.warning("Error transitioning Test Case '%s': [%s] %s", issue.key, response.status_code,
                        get_error_message(response.content.decode()))
     else:
-        logger.debug("Transition response with status " + str(response.status_code) +
-                     " is: '%s'", response.content.decode().splitlines()[0])
+        logger.debug("Transition response with status %s is: '%s'", response.status_code,
+                     response.content.decode().splitlines()[0])
 
 
-def add_results(jira: JIRA, issueid: str, attachements: list[str] = None):
-    """Adds the results to the execution or the associated test case instead"""
+def get_transition_id(server: JIRA, issue_key: str, current_status: str, test_status: str):
+    """Get the transition id for the given status, transitions are requested only once for each project and
+    current status, as available transitions depend on the workflow step of the issue
 
-    def addscreenshots(issueid: str, attachements: list[str] = None):
-        """
-            Attach the screenshots found the report folder to the jira issue provided
-            param issueid: Full Jira ID
-            param attachements: Absolute paths of attachments
-            Raises FileNotFound: if an attachement file is not found
-        """
-
-        if attachements:
-            for filepath in attachements:
-                if os.path.isfile(path.join(filepath)):
-                    with open(filepath, 'rb') as file:
-                        logger.debug("Opened screenshot " + file.name)
-                        jira.add_attachment(issue=issueid, attachment=file)
-                        logger.info("Attached " + file.name + " into " + issueid)
-        else:
-            screenshotspath = path.join(path.dirname(__file__), ".", DriverWrappersPool.screenshots_directory)
-            logger.debug("Reading screenshot folder " + screenshotspath)
-
-            if len(os.listdir(screenshotspath)) < 1:
-                logger.warning("Screenshot folder empty...")
-                return
-
-            for filename in os.listdir(screenshotspath):
-                if os.path.isfile(path.join(screenshotspath, filename)):
-                    with open(os.path.join(screenshotspath, filename), 'rb') as file:
-                        logger.debug("Opened screenshot " + file.name)
-                        jira.add_attachment(issue=issueid, attachment=file)
-                        logger.info("Attached " + filename + " into " + issueid)
-        logger.info("Screenshots uploaded...")
-
-    def addlogs(issueid: str):
-        """
-            Attach the logs in the report folder to the jira issue provided
-            param issueid Full Jira ID
-            Raises FileNotFound Error if the log file is not found in reports
-        """
-        logpath = path.join(path.dirname(__file__),
-                            ".", DriverWrappersPool.screenshots_directory, "..", "..", "toolium.log")
-
-        with open(logpath, 'rb') as file:
-            logger.debug("Opened log file " + file.name)
-            jira.add_attachment(issue=issueid, attachment=file)
-            logger.info("Attached log into " + issueid)
+    :param server: opened Jira session
+    :param issue_key: issue key in Jira
+    :param current_status: the current status of the issue
+    :param test_status: the new status of the issue
+    :returns: transition id or None if the issue has not a transition with that name from its current status
+    """
+    cache_key = (issue_key.rsplit('-', 1)[0], current_status.lower())
+    if cache_key not in _transitions_cache:
+        _transitions_cache[cache_key] = {t['name'].lower(): int(t['id']) for t in server.transitions(issue_key)}
+    return _transitions_cache[cache_key].get(test_status.lower())
 
+
+def add_results(jira: JIRA, issueid: str, attachements: list[str] = None):
+    """Adds the results to the execution or the associated test case instead"""
     try:
         logger.info("Adding results to issue...")
-        addscreenshots(issueid, attachements) if attachements else addscreenshots(issueid)
-        addlogs(issueid)
-        logger.debug("Results added to issue " + issueid)
+        _add_screenshots(jira, issueid, attachements)
+        _add_logs(jira, issueid)
+        logger.debug("Results added to issue %s", issueid)
 
     except Exception as error:
-        logger.error("Results not added, exception:" + str(error))
+        logger.error("Results not added, exception: %s", error)
+
+
+def _add_screenshots(jira: JIRA, issueid: str, attachements: list[str] = None):
+    """
+        Attach the screenshots found the report folder to the jira issue provided
+        param jira: Jira client
+        param issueid: Full Jira ID
+        param attachements: Absolute paths of attachments
+    """
+    if attachements:
+        filepaths = attachements
+    else:
+        screenshotspath = path.join(path.dirname(__file__), ".", DriverWrappersPool.screenshots_directory)
+        logger.debug("Reading screenshot folder %s", screenshotspath)
+
+        with os.scandir(screenshotspath) as entries:
+            filepaths = [entry.path for entry in entries if entry.is_file()]
+
+        if not filepaths:
+            logger.warning("Screenshot folder empty...")
+            return
+
+    # Upload files in parallel, each thread opens and closes its own file
+    with ThreadPoolExecutor(max_workers=get_attachment_workers()) as executor:
+        list(executor.map(lambda filepath: _add_screenshot(jira, issueid, filepath), filepaths))
+    logger.info("Screenshots uploaded...")
+
+
+def _add_screenshot(jira: JIRA, issueid: str, filepath: str):
+    """
+        Attach a screenshot file to the jira issue provided
+        param jira: Jira client
+        param issueid: Full Jira ID
+        param filepath: Absolute path of the screenshot
+    """
+    try:
+        with open(filepath, 'rb') as file:
+            logger.debug("Opened screenshot %s", file.name)
+            jira.add_attachment(issue=issueid, attachment=file)
+            logger.info("Attached %s into %s", file.name, issueid)
+    except FileNotFoundError:
+        logger.warning("Screenshot not found: %s", filepath)
+
+
+def _add_logs(jira: JIRA, issueid: str):
+    """
+        Attach the logs in the report folder to the jira issue provided
+        param jira: Jira client
+        param issueid Full Jira ID
+        Raises FileNotFound Error if the log file is not found in reports
+    """
+    logpath = path.join(path.dirname(__file__),
+                        ".", DriverWrappersPool.screenshots_directory, "..", "..", "toolium.log")
+
+    with open(logpath, 'rb') as file:
+        logger.debug("Opened log file %s", file.name)
+        jira.add_attachment(issue=issueid, attachment=file)
+        logger.info("Attached log into %s", issueid)
 
 
 def get_error_message(response_content: str):
@@ -318,19 +415,31 @@ def get_error_message(response_content: str):
     :param response_content: HTTP response from test case execution API
     :returns: error message
     """
-    apache_regex = re.compile(r'.*<u>(.*)</u></p><p>.*')
-    match = apache_regex.search(response_content)
-    if match:
-        error_message = match.group(1)
-        logger.debug("Error message extracted from HTTP response with regex:" + apache_regex.__repr__())
+    error_message = _get_text_between(response_content, '<u>', '</u></p><p>')
+    if error_message is not None:
+        logger.debug("Error message extracted from HTTP response between <u> and </u></p><p> tags")
+        return error_message
 
-    else:
-        local_regex = re.compile(r'.*<title>(.*)</title>.*')
-        match = local_regex.search(response_content)
-        if match:
-            error_message = match.group(1)
-        else:
-            error_message = response_content
-        logger.debug("Error message extracted from HTTP response with regex:" + local_regex.__repr__())
+    error_message = _get_text_between(response_content, '<title>', '</title>')
+    if error_message is not None:
+        logger.debug("Error message extracted from HTTP response between <title> and </title> tags")
+        return error_message
 
-    return error_message
+    logger.debug("Error message not found in HTTP response, returning the whole response")
+    return response_content
+
+
+def _get_text_between(text: str, start_tag: str, end_tag: str):
+    """Get the text between the first start tag and the next end tag, scanning the text only once
+
+    :param text: text to be searched
+    :param start_tag: start tag
+    :param end_tag: end tag
+    :returns: text between both tags or None if they are not found
+    """
+    start = text.find(start_tag)
+    if start < 0:
+        return None
+    start += len(start_tag)
+    end = text.find(end_tag, start)
+    return text[start:end] if end >= 0 else None
@@ -30,7 +30,8 @@ class Button(PageElement):
         try:
             return self.web_element.text
         except StaleElementReferenceException:
-            # Retry if element has changed
+            # Retry if element has changed, searching it again even if it was saved
+            self.reset_object()
             return self.web_element.text
 
     def click(self):
@@ -41,6 +42,7 @@ class Button(PageElement):
         try:
             self.wait_until_clickable().web_element.click()
         except StaleElementReferenceException:
-            # Retry if element has changed
+            # Retry if element has changed, searching it again even if it was saved
+            self.reset_object()
             self.web_element.click()
         return self
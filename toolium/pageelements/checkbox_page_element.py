@@ -40,15 +40,21 @@ class Checkbox(Button):
 
         :returns: page element instance
         """
-        if not self.is_selected():
-            self.web_element.click()
-        return self
+        return self.set_checked(True)
 
     def uncheck(self):
         """Uncheck the checkbox
 
         :returns: page element instance
         """
-        if self.is_selected():
+        return self.set_checked(False)
+
+    def set_checked(self, value):
+        """Select or uncheck the checkbox, clicking it only if its state is different
+
+        :param value: True to select the checkbox, False to uncheck it
+        :returns: page element instance
+        """
+        if self.is_selected() != value:
             self.web_element.click()
         return self
@@ -65,7 +65,8 @@ class InputText(PageElement):
         try:
             self.wait_until_clickable().web_element.click()
         except StaleElementReferenceException:
-            # Retry if element has changed
+            # Retry if element has changed, searching it again even if it was saved
+            self.reset_object()
             self.web_element.click()
         return self
 
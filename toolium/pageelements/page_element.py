@@ -15,14 +15,59 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import functools
+import re
+import sys
+
 from playwright.sync_api import Page
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
 from selenium.webdriver.common.by import By
 
 from toolium.driver_wrapper import DriverWrappersPool
 from toolium.pageobjects.common_object import CommonObject
 from toolium.visual_test import VisualTest
 
+# Element id that can be used as is in an XPath string literal
+_SIMPLE_ID = re.compile(r'^[A-Za-z][\w-]*$')
+
+# Locator types that can be searched from javascript in locate_many
+_SCRIPT_LOCATOR_TYPES = frozenset((By.ID, By.CSS_SELECTOR, By.XPATH))
+
+# Javascript to find the first element of each locator, returning null for those that are not found
+_LOCATE_MANY_SCRIPT = (
+    'return arguments[0].map(function(locator) {'
+    '  if (locator[0] === "id") { return document.getElementById(locator[1]); }'
+    '  if (locator[0] === "xpath") {'
+    '    return document.evaluate(locator[1], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)'
+    '      .singleNodeValue;'
+    '  }'
+    '  return document.querySelector(locator[1]);'
+    '});'
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _fuse_locator(parent_locator, child_locator):
+    """Fuse parent and child locators into a single locator, so that the child element is found in one request
+
+    :param parent_locator: parent element locator as a tuple (locator_type, locator_value)
+    :param child_locator: child element locator as a tuple (locator_type, locator_value)
+    :returns: fused locator as a tuple (locator_type, locator_value) or None if locators are not compatible
+    """
+    # Results are cached, page objects search the same locators many times during a test execution
+    parent_by, parent_value = parent_locator
+    child_by, child_value = child_locator
+    # Only XPath child locators relative to the parent element are fused, CSS child selectors are not, because
+    # element scoped CSS searches match the selector against the whole document (e.g. 'form input' in a form)
+    if child_by != By.XPATH or not child_value.startswith('./') or '|' in child_value:
+        return None
+    if parent_by == By.ID and _SIMPLE_ID.match(parent_value):
+        return By.XPATH, f'(//*[@id="{parent_value}"])[1]{child_value[1:]}'
+    if parent_by == By.XPATH:
+        # Search only inside the first parent element, as find_element does
+        return By.XPATH, f'({parent_value})[1]{child_value[1:]}'
+    return None
+
 
 class PageElement(CommonObject):
     """Class to represent a web or a mobile page element
@@ -55,7 +100,8 @@ class PageElement(CommonObject):
         :param webview_csc_args: arguments list for webview_context_selection_callback
         """
         super(PageElement, self).__init__()
-        self.locator = (by, value)  #: tuple with locator type and locator value
+        # Locator values are interned, so that equal locators of different page objects share the same string
+        self.locator = (by, sys.intern(value) if isinstance(value, str) else value)  #: locator type and value
         self.parent = parent  #: element from which to find actual elements
         self.order = order  #: index value if the locator returns more than one element
         self.wait = wait  #: True if it must be loaded in wait_until_loaded method of the container page object
@@ -68,7 +114,7 @@ class PageElement(CommonObject):
         self.reset_object(self.driver_wrapper)
 
     def reset_object(self, driver_wrapper=None):
-        """Reset each page element object
+        """Reset each page element object, so that its web element is searched again in the next access
 
         :param driver_wrapper: driver wrapper instance
         """
@@ -124,11 +170,70 @@ class PageElement(CommonObject):
                     self._web_element = self.driver.locator(locator)[self.order] if self.order \
                         else self.driver.locator(locator)
                 else:
-                    self.logger.debug('Element will be searched from parent element or from driver')
-                    base = self.utils.get_web_element(self.parent) if self.parent else self.driver
+                    fused_locator = self._get_fused_locator() if self.parent else None
+                    if fused_locator:
+                        self.logger.debug('Element will be searched from driver with parent and element locators')
+                        base, locator = self.driver, fused_locator
+                    else:
+                        self.logger.debug('Element will be searched from parent element or from driver')
+                        base = self.utils.get_web_element(self.parent) if self.parent else self.driver
+                        locator = self.locator
                     self.logger.debug('Find elements and get the correct index or find a single element')
-                    self._web_element = base.find_elements(*self.locator)[self.order] if self.order \
-                        else base.find_element(*self.locator)
+                    self._web_element = base.find_elements(*locator)[self.order] if self.order \
+                        else base.find_element(*locator)
+
+    def _get_fused_locator(self):
+        """Get a single locator to find the element from the driver, without finding its parent element before
+
+        :returns: fused locator as a tuple (locator_type, locator_value) or None if parent can not be fused
+        """
+        # Locators are only fused in browsers, in native apps By.ID is not an id attribute of the page source
+        if not self.driver_wrapper.is_web_test():
+            return None
+        parent = self.parent
+        if isinstance(parent, PageElement):
+            # Parent page elements are not fused if they save their web element to be reused by other elements
+            if parent.parent or parent.order or parent.shadowroot or \
+                    self.driver_wrapper.config.getboolean_optional('Driver', 'save_web_element'):
+                return None
+            parent = parent.locator
+        elif not isinstance(parent, tuple):
+            return None
+        return _fuse_locator(parent, self.locator)
+
+    def _can_be_located_by_script(self, driver_wrapper):
+        """Check if the element can be searched from javascript along with other elements in locate_many
+
+        :param driver_wrapper: driver wrapper of the elements that are searched together
+        :returns: True if the element can be searched from javascript
+        """
+        return self.driver_wrapper is driver_wrapper and not self.parent and not self.order and \
+            not self.shadowroot and self.locator[0] in _SCRIPT_LOCATOR_TYPES and \
+            not (self._web_element and self.driver_wrapper.config.getboolean_optional('Driver', 'save_web_element'))
+
+    @classmethod
+    def locate_many(cls, page_elements):
+        """Find several page elements with a single driver request and save their web elements
+
+        Elements located by id, css selector or xpath without parent are searched at once using javascript in web
+        tests, the rest of elements and those not found are searched one by one as usual.
+
+        :param page_elements: list of page elements
+        :returns: list of web elements in the same order as page elements
+        """
+        found_elements = {}
+        driver_wrapper = page_elements[0].driver_wrapper if page_elements else None
+        if driver_wrapper and driver_wrapper.is_web_test() and not isinstance(driver_wrapper.driver, Page):
+            script_elements = [element for element in page_elements
+                               if element._can_be_located_by_script(driver_wrapper)]
+            if len(script_elements) > 1:
+                web_elements = driver_wrapper.driver.execute_script(
+                    _LOCATE_MANY_SCRIPT, [list(element.locator) for element in script_elements])
+                for element, web_element in zip(script_elements, web_elements):
+                    if web_element:
+                        element._web_element = web_element
+                        found_elements[id(element)] = web_element
+        return [found_elements.get(id(element)) or element.web_element for element in page_elements]
 
     def _android_automatic_context_selection(self):
         """Change context selection depending if the element is a webview for android devices"""
@@ -198,9 +303,8 @@ class PageElement(CommonObject):
 
         :returns: page element instance
         """
-        x = self.web_element.location['x']
-        y = self.web_element.location['y']
-        self.driver.execute_script('window.scrollTo({0}, {1})'.format(x, y))
+        # Align element to the top left corner in a single request, without reading its location before
+        self.driver.execute_script('arguments[0].scrollIntoView({block: "start", inline: "start"});', self.web_element)
         return self
 
     def is_present(self):
@@ -275,7 +379,7 @@ class PageElement(CommonObject):
         """
         return self._wait_until_condition('clickable', timeout)
 
-    def assert_screenshot(self, filename, threshold=0, exclude_elements=[], force=False):
+    def assert_screenshot(self, filename, threshold=0, exclude_elements=None, force=False):
         """Assert that a screenshot of the element is the same as a screenshot on disk, within a given threshold.
 
         :param filename: the filename for the screenshot, which will be appended with ``.png``
@@ -284,8 +388,11 @@ class PageElement(CommonObject):
                                  locator_value) that must be excluded from the assertion
         :param force: if True, the screenshot is compared even if visual testing is disabled by configuration
         """
+        if not force and not self.driver_wrapper.config.getboolean_optional('VisualTests', 'enabled'):
+            # Visual testing is disabled, so the element is not searched
+            return
         VisualTest(self.driver_wrapper, force).assert_screenshot(self.web_element, filename, self.__class__.__name__,
-                                                                 threshold, exclude_elements)
+                                                                 threshold, exclude_elements or [])
 
     def get_attribute(self, name: str):
         """Get the given attribute or property of the element
@@ -293,7 +400,12 @@ class PageElement(CommonObject):
         :param name: name of the attribute/property to retrieve
         :returns: attribute value
         """
-        return self.web_element.get_attribute(name)
+        try:
+            return self.web_element.get_attribute(name)
+        except StaleElementReferenceException:
+            # Retry if element has changed, searching it again even if it was saved
+            self.reset_object()
+            return self.web_element.get_attribute(name)
 
     def set_focus(self):
         """
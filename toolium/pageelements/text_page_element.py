@@ -16,6 +16,8 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from selenium.common.exceptions import StaleElementReferenceException
+
 from toolium.pageelements.page_element import PageElement
 
 
@@ -26,4 +28,9 @@ class Text(PageElement):
 
         :returns: the text of the element
         """
-        return self.web_element.text
+        try:
+            return self.web_element.text
+        except StaleElementReferenceException:
+            # Retry if element has changed, searching it again even if it was saved
+            self.reset_object()
+            return self.web_element.text
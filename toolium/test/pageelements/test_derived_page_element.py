@@ -23,7 +23,7 @@ from selenium.webdriver.remote.webelement import WebElement
 
 from toolium.driver_wrapper import DriverWrapper
 from toolium.driver_wrappers_pool import DriverWrappersPool
-from toolium.pageelements import PageElement, Text, InputText, Button, Select, Group
+from toolium.pageelements import PageElement, Text, InputText, Button, Select, Group, Checkbox
 from toolium.pageelements import select_page_element
 from toolium.pageobjects.page_object import PageObject
 
@@ -55,6 +55,7 @@ class LoginPageObject(PageObject):
     password = InputText(By.ID, 'password')
     language = Select(By.ID, 'language')
     login = Button(By.ID, 'login')
+    remember = Checkbox(By.ID, 'remember')
     menu = Menu(By.ID, 'menu')
     username_shadowroot = InputText(By.XPATH, '//input[1]', shadowroot='shadowroot_css')
 
@@ -174,6 +175,40 @@ def test_click_button(driver_wrapper):
     mock_element.click.assert_called_once_with()
 
 
+@pytest.mark.parametrize("selected, value, clicked", [
+    (False, True, True),
+    (True, True, False),
+    (True, False, True),
+    (False, False, False),
+])
+def test_set_checked_checkbox(selected, value, clicked, driver_wrapper):
+    driver_wrapper.driver.find_element.return_value = mock_element
+    mock_element.is_selected.return_value = selected
+    LoginPageObject().remember.set_checked(value)
+
+    driver_wrapper.driver.find_element.assert_called_with(By.ID, 'remember')
+    assert mock_element.click.called == clicked
+
+
+class AriaCheckbox(Checkbox):
+    def is_selected(self):
+        return self.web_element.get_attribute('aria-checked') == 'true'
+
+
+@pytest.mark.parametrize("checked, value, clicked", [
+    ('false', True, True),
+    ('true', True, False),
+])
+def test_set_checked_checkbox_overridden_is_selected(checked, value, clicked, driver_wrapper):
+    driver_wrapper.driver.find_element.return_value = mock_element
+    mock_element.is_selected.return_value = False
+    mock_element.get_attribute.return_value = checked
+    AriaCheckbox(By.ID, 'remember').set_checked(value)
+
+    mock_element.get_attribute.assert_called_once_with('aria-checked')
+    assert mock_element.click.called == clicked
+
+
 def test_group_reset_object(driver_wrapper):
     login_page = LoginPageObject()
 
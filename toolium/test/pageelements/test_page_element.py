@@ -19,7 +19,7 @@ import os
 
 import mock
 import pytest
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
@@ -27,6 +27,7 @@ from toolium.config_files import ConfigFiles
 from toolium.driver_wrapper import DriverWrapper
 from toolium.driver_wrappers_pool import DriverWrappersPool
 from toolium.pageelements import PageElement, Group
+from toolium.pageelements.page_element import _fuse_locator
 from toolium.pageobjects.page_object import PageObject
 
 child_element = 'child_element'
@@ -151,6 +152,70 @@ def test_get_web_element_with_parent_locator(driver_wrapper):
     mock_element.find_element.assert_called_once_with(By.ID, 'address')
 
 
+@pytest.mark.parametrize("parent, locator, fused_locator", [
+    ((By.ID, 'parent'), (By.XPATH, './/input'), (By.XPATH, '(//*[@id="parent"])[1]//input')),
+    ((By.XPATH, '//form'), (By.XPATH, './/input'), (By.XPATH, '(//form)[1]//input')),
+    ((By.XPATH, '//form'), (By.XPATH, './input[@name="address"]'), (By.XPATH, '(//form)[1]/input[@name="address"]')),
+])
+def test_get_web_element_with_fused_parent_locator(parent, locator, fused_locator, driver_wrapper):
+    driver_wrapper.driver.find_element.return_value = child_element
+    web_element = PageElement(*locator, parent=parent).web_element
+
+    assert web_element == child_element
+    driver_wrapper.driver.find_element.assert_called_once_with(*fused_locator)
+
+
+@pytest.mark.parametrize("parent, locator", [
+    ((By.ID, 'parent'), (By.XPATH, '//input')),
+    ((By.ID, 'parent.id'), (By.XPATH, './/input')),
+    ((By.ID, 'parent'), (By.CSS_SELECTOR, 'input.address')),
+    ((By.ID, 'login'), (By.CSS_SELECTOR, 'form input')),
+    ((By.XPATH, '//form'), (By.XPATH, './/input | .//select')),
+    ((By.XPATH, '//form'), (By.CSS_SELECTOR, 'input')),
+    ((By.CSS_SELECTOR, 'form'), (By.CSS_SELECTOR, 'input')),
+])
+def test_get_web_element_with_not_fused_parent_locator(parent, locator, driver_wrapper):
+    driver_wrapper.driver.find_element.return_value = mock_element
+    web_element = PageElement(*locator, parent=parent).web_element
+
+    assert web_element == child_element
+    driver_wrapper.driver.find_element.assert_called_once_with(*parent)
+    mock_element.find_element.assert_called_once_with(*locator)
+
+
+def test_fuse_locator_cached(driver_wrapper):
+    _fuse_locator.cache_clear()
+    PageElement(By.XPATH, './/input', parent=(By.XPATH, '//form')).web_element
+    PageElement(By.XPATH, './/input', parent=(By.XPATH, '//form')).web_element
+
+    assert _fuse_locator.cache_info().hits == 1
+    assert _fuse_locator.cache_info().misses == 1
+
+
+@pytest.mark.parametrize("parent, locator", [
+    ((By.ID, 'login'), (By.XPATH, './/android.widget.TextView')),
+    ((By.XPATH, '//android.widget.LinearLayout'), (By.XPATH, './/android.widget.TextView')),
+])
+def test_get_web_element_with_not_fused_parent_locator_mobile(parent, locator, driver_wrapper):
+    driver_wrapper.is_web_test = mock.MagicMock(return_value=False)
+    driver_wrapper.driver.find_element.return_value = mock_element
+    web_element = PageElement(*locator, parent=parent).web_element
+
+    assert web_element == child_element
+    driver_wrapper.driver.find_element.assert_called_once_with(*parent)
+    mock_element.find_element.assert_called_once_with(*locator)
+
+
+def test_get_web_element_with_fused_parent_page_element(driver_wrapper):
+    driver_wrapper.driver.find_element.return_value = child_element
+    parent = PageElement(By.XPATH, '//form')
+    web_element = PageElement(By.XPATH, './/input', parent=parent).web_element
+
+    assert web_element == child_element
+    assert parent._web_element is None
+    driver_wrapper.driver.find_element.assert_called_once_with(By.XPATH, '(//form)[1]//input')
+
+
 def test_get_web_element_with_parent_web_element(driver_wrapper):
     web_element = RegisterPageObject(driver_wrapper).email.web_element
 
@@ -358,6 +423,7 @@ def test_wait_until_clickable_exception_custom_timeout(driver_wrapper):
 @mock.patch('toolium.visual_test.VisualTest.__init__', return_value=None)
 @mock.patch('toolium.visual_test.VisualTest.assert_screenshot')
 def test_assert_screenshot(visual_assert_screenshot, visual_init, driver_wrapper):
+    driver_wrapper.config.set('VisualTests', 'enabled', 'true')
     driver_wrapper.driver.find_element.return_value = mock_element
 
     RegisterPageObject(driver_wrapper).username.assert_screenshot('filename')
@@ -366,6 +432,16 @@ def test_assert_screenshot(visual_assert_screenshot, visual_init, driver_wrapper
     visual_assert_screenshot.assert_called_once_with(mock_element, 'filename', 'PageElement', 0, [])
 
 
+@mock.patch('toolium.visual_test.VisualTest.__init__', return_value=None)
+@mock.patch('toolium.visual_test.VisualTest.assert_screenshot')
+def test_assert_screenshot_disabled(visual_assert_screenshot, visual_init, driver_wrapper):
+    RegisterPageObject(driver_wrapper).username.assert_screenshot('filename')
+
+    visual_init.assert_not_called()
+    visual_assert_screenshot.assert_not_called()
+    driver_wrapper.driver.find_element.assert_not_called()
+
+
 @mock.patch('toolium.visual_test.VisualTest.__init__', return_value=None)
 @mock.patch('toolium.visual_test.VisualTest.assert_screenshot')
 def test_assert_screenshot_options(visual_assert_screenshot, visual_init, driver_wrapper):
@@ -379,6 +455,47 @@ def test_assert_screenshot_options(visual_assert_screenshot, visual_init, driver
     visual_assert_screenshot.assert_called_once_with(mock_element, 'filename', 'PageElement', 0.1, [mock_element])
 
 
+def test_scroll_element_into_view(driver_wrapper):
+    driver_wrapper.driver.find_element.return_value = mock_element
+
+    page_element = RegisterPageObject(driver_wrapper).username.scroll_element_into_view()
+
+    assert isinstance(page_element, PageElement)
+    driver_wrapper.driver.execute_script.assert_called_once_with(
+        'arguments[0].scrollIntoView({block: "start", inline: "start"});', mock_element)
+
+
+def test_locate_many(driver_wrapper):
+    driver_wrapper.is_web_test = mock.MagicMock(return_value=True)
+    driver_wrapper.driver.execute_script.return_value = ['username_element', None]
+    driver_wrapper.driver.find_element.return_value = 'language_element'
+    page_object = RegisterPageObject(driver_wrapper)
+    page_elements = [page_object.username, page_object.email, page_object.language]
+
+    web_elements = PageElement.locate_many(page_elements)
+
+    assert web_elements == ['username_element', child_element, 'language_element']
+    driver_wrapper.driver.execute_script.assert_called_once()
+    args, kwargs = driver_wrapper.driver.execute_script.call_args
+    assert args[1] == [[By.XPATH, '//input[0]'], [By.ID, 'language']]
+    assert page_object.username._web_element == 'username_element'
+    driver_wrapper.driver.find_element.assert_called_once_with(By.ID, 'language')
+    mock_element.find_element.assert_called_once_with(By.ID, 'email')
+
+
+def test_locate_many_mobile_test(driver_wrapper):
+    driver_wrapper.is_web_test = mock.MagicMock(return_value=False)
+    driver_wrapper.driver.find_element.return_value = mock_element
+    page_object = RegisterPageObject(driver_wrapper)
+
+    web_elements = PageElement.locate_many([page_object.username, page_object.language])
+
+    assert web_elements == [mock_element, mock_element]
+    driver_wrapper.driver.execute_script.assert_not_called()
+    driver_wrapper.driver.find_element.assert_has_calls([mock.call(By.XPATH, '//input[0]'),
+                                                         mock.call(By.ID, 'language')])
+
+
 def test_get_attribute(driver_wrapper):
     driver_wrapper.driver.find_element.return_value = mock_element
 
@@ -387,6 +504,20 @@ def test_get_attribute(driver_wrapper):
     mock_element.get_attribute.assert_called_once_with('attribute_name')
 
 
+def test_get_attribute_stale_saved_element(driver_wrapper):
+    driver_wrapper.config.set('Driver', 'save_web_element', 'true')
+    stale_element = mock.MagicMock(spec=WebElement)
+    stale_element.get_attribute.side_effect = StaleElementReferenceException('stale element')
+    mock_element.get_attribute.return_value = 'attribute_value'
+    driver_wrapper.driver.find_element.side_effect = [stale_element, mock_element]
+    page_element = RegisterPageObject(driver_wrapper).username
+    page_element.web_element
+
+    assert page_element.get_attribute('attribute_name') == 'attribute_value'
+    assert page_element._web_element == mock_element
+    assert driver_wrapper.driver.find_element.call_count == 2
+
+
 def test_automatic_context_selection_group(driver_wrapper):
     driver_wrapper.utils.wait_until_element_visible = mock.MagicMock(return_value=mock_element)
     driver_wrapper.is_android_test = mock.MagicMock(return_value=True)
@@ -23,7 +23,7 @@ import pytest
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from selenium.webdriver.firefox.options import Options
 
-from toolium.config_driver import ConfigDriver
+from toolium.config_driver import ConfigDriver, _playwright_default_timeout, _playwright_window_position
 from toolium.config_parser import ExtendedConfigParser
 from toolium.driver_wrappers_pool import DriverWrappersPool
 
@@ -68,6 +68,20 @@ def test_create_driver_local(config, utils):
     assert driver == 'local driver mock'
 
 
+@mock.patch('toolium.config_driver.webdriver')
+def test_create_driver_remote_reads_driver_type_once(webdriver_mock, config, utils):
+    config.set('Server', 'enabled', 'true')
+    config.set('Driver', 'type', 'iexplore-11')
+    utils.get_driver_name.return_value = 'iexplore'
+    config_driver = ConfigDriver(config, utils)
+
+    with mock.patch.object(config, 'get', wraps=config.get) as get_mock:
+        config_driver.create_driver()
+    assert get_mock.call_args_list.count(mock.call('Driver', 'type')) == 1
+    args, kwargs = webdriver_mock.Remote.call_args
+    assert kwargs['desired_capabilities']['version'] == '11'
+
+
 def test_create_driver_remote(config, utils):
     config.set('Server', 'enabled', 'true')
     config.set('Driver', 'type', 'firefox')
@@ -295,6 +309,15 @@ def test_create_local_driver_unknown_driver(config, utils):
     assert 'Unknown driver unknown' == str(excinfo.value)
 
 
+def test_get_capabilities_from_driver_type_returns_copy(config, utils):
+    config_driver = ConfigDriver(config, utils)
+
+    capabilities = config_driver._get_capabilities_from_driver_type('chrome')
+    capabilities['version'] = '100'
+    assert capabilities != DesiredCapabilities.CHROME
+    assert config_driver._get_capabilities_from_driver_type('chrome') == DesiredCapabilities.CHROME
+
+
 @mock.patch('toolium.config_driver.FirefoxOptions')
 @mock.patch('toolium.config_driver.webdriver')
 def test_create_local_driver_capabilities(webdriver_mock, options, config, utils):
@@ -334,7 +357,7 @@ def test_create_remote_driver_firefox(webdriver_mock, config, utils):
     capabilities = DesiredCapabilities.FIREFOX.copy()
     capabilities['firefox_profile'] = 'encoded profile'
     webdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                  desired_capabilities=capabilities)
+                                                  desired_capabilities=capabilities, keep_alive=True)
 
 
 @mock.patch('toolium.config_driver.webdriver')
@@ -354,7 +377,7 @@ def test_create_remote_driver_chrome(webdriver_mock, config, utils):
     capabilities = DesiredCapabilities.CHROME.copy()
     capabilities['goog:chromeOptions'] = 'chrome options'
     webdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                  desired_capabilities=capabilities)
+                                                  desired_capabilities=capabilities, keep_alive=True)
 
 
 @mock.patch('toolium.config_driver.webdriver')
@@ -398,7 +421,7 @@ def test_create_remote_driver_chrome_multiple_options(webdriver_mock, config, ut
     capabilities = DesiredCapabilities.CHROME.copy()
     capabilities['goog:chromeOptions'] = final_chrome_options
     webdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                  desired_capabilities=capabilities)
+                                                  desired_capabilities=capabilities, keep_alive=True)
 
 
 @mock.patch('toolium.config_driver.webdriver')
@@ -418,7 +441,7 @@ def test_create_remote_driver_chrome_old_selenium(webdriver_mock, config, utils)
     capabilities = DesiredCapabilities.CHROME.copy()
     capabilities['chromeOptions'] = 'chrome options'
     webdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                  desired_capabilities=capabilities)
+                                                  desired_capabilities=capabilities, keep_alive=True)
 
 
 @mock.patch('toolium.config_driver.webdriver')
@@ -431,7 +454,7 @@ def test_create_remote_driver_safari(webdriver_mock, config, utils):
 
     config_driver._create_remote_driver()
     webdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                  desired_capabilities=DesiredCapabilities.SAFARI)
+                                                  desired_capabilities=DesiredCapabilities.SAFARI, keep_alive=True)
 
 
 @mock.patch('toolium.config_driver.webdriver')
@@ -447,7 +470,7 @@ def test_create_remote_driver_opera(webdriver_mock, config, utils):
     capabilities['opera.autostart'] = True
     capabilities['opera.arguments'] = '-fullscreen'
     webdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                  desired_capabilities=capabilities)
+                                                  desired_capabilities=capabilities, keep_alive=True)
 
 
 @mock.patch('toolium.config_driver.webdriver')
@@ -460,7 +483,8 @@ def test_create_remote_driver_iexplore(webdriver_mock, config, utils):
 
     config_driver._create_remote_driver()
     webdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                  desired_capabilities=DesiredCapabilities.INTERNETEXPLORER)
+                                                  desired_capabilities=DesiredCapabilities.INTERNETEXPLORER,
+                                                  keep_alive=True)
 
 
 @mock.patch('toolium.config_driver.webdriver')
@@ -473,7 +497,7 @@ def test_create_remote_driver_edge(webdriver_mock, config, utils):
 
     config_driver._create_remote_driver()
     webdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                  desired_capabilities=DesiredCapabilities.EDGE)
+                                                  desired_capabilities=DesiredCapabilities.EDGE, keep_alive=True)
 
 
 @mock.patch('toolium.config_driver.webdriver')
@@ -486,11 +510,11 @@ def test_create_remote_driver_phantomjs(webdriver_mock, config, utils):
 
     config_driver._create_remote_driver()
     webdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                  desired_capabilities=DesiredCapabilities.PHANTOMJS)
+                                                  desired_capabilities=DesiredCapabilities.PHANTOMJS, keep_alive=True)
 
 
-@mock.patch('toolium.config_driver.appiumdriver')
-def test_create_remote_driver_android(appiumdriver_mock, config, utils):
+@mock.patch('appium.webdriver.Remote')
+def test_create_remote_driver_android(appium_remote_mock, config, utils):
     config.set('Driver', 'type', 'android')
     config.add_section('AppiumCapabilities')
     config.set('AppiumCapabilities', 'automationName', 'Appium')
@@ -502,12 +526,12 @@ def test_create_remote_driver_android(appiumdriver_mock, config, utils):
 
     config_driver._create_remote_driver()
     capabilities = {'automationName': 'Appium', 'platformName': 'Android'}
-    appiumdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                     desired_capabilities=capabilities)
+    appium_remote_mock.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
+                                               desired_capabilities=capabilities, keep_alive=True)
 
 
-@mock.patch('toolium.config_driver.appiumdriver')
-def test_create_remote_driver_ios(appiumdriver_mock, config, utils):
+@mock.patch('appium.webdriver.Remote')
+def test_create_remote_driver_ios(appium_remote_mock, config, utils):
     config.set('Driver', 'type', 'ios')
     config.add_section('AppiumCapabilities')
     config.set('AppiumCapabilities', 'automationName', 'Appium')
@@ -519,12 +543,12 @@ def test_create_remote_driver_ios(appiumdriver_mock, config, utils):
 
     config_driver._create_remote_driver()
     capabilities = {'automationName': 'Appium', 'platformName': 'iOS'}
-    appiumdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                     desired_capabilities=capabilities)
+    appium_remote_mock.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
+                                               desired_capabilities=capabilities, keep_alive=True)
 
 
-@mock.patch('toolium.config_driver.appiumdriver')
-def test_create_remote_driver_iphone(appiumdriver_mock, config):
+@mock.patch('appium.webdriver.Remote')
+def test_create_remote_driver_iphone(appium_remote_mock, config):
     config.set('Driver', 'type', 'iphone')
     config.add_section('AppiumCapabilities')
     config.set('AppiumCapabilities', 'automationName', 'Appium')
@@ -537,8 +561,8 @@ def test_create_remote_driver_iphone(appiumdriver_mock, config):
 
     config_driver._create_remote_driver()
     capabilities = {'automationName': 'Appium', 'platformName': 'iOS'}
-    appiumdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                     desired_capabilities=capabilities)
+    appium_remote_mock.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
+                                               desired_capabilities=capabilities, keep_alive=True)
 
 
 @mock.patch('toolium.config_driver.webdriver')
@@ -554,7 +578,23 @@ def test_create_remote_driver_version_platform(webdriver_mock, config, utils):
     capabilities['version'] = '11'
     capabilities['platform'] = 'WIN10'
     webdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                  desired_capabilities=capabilities)
+                                                  desired_capabilities=capabilities, keep_alive=True)
+
+
+@mock.patch('toolium.config_driver.webdriver')
+def test_create_remote_driver_version_mapped_platform(webdriver_mock, config, utils):
+    config.set('Driver', 'type', 'iexplore-11-on-windows_10')
+    server_url = 'http://10.20.30.40:5555'
+    utils.get_server_url.return_value = server_url
+    utils.get_driver_name.return_value = 'iexplore'
+    config_driver = ConfigDriver(config, utils)
+
+    config_driver._create_remote_driver()
+    capabilities = DesiredCapabilities.INTERNETEXPLORER.copy()
+    capabilities['version'] = '11'
+    capabilities['platform'] = 'WIN10'
+    webdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
+                                                  desired_capabilities=capabilities, keep_alive=True)
 
 
 @mock.patch('toolium.config_driver.webdriver')
@@ -569,7 +609,7 @@ def test_create_remote_driver_version(webdriver_mock, config, utils):
     capabilities = DesiredCapabilities.INTERNETEXPLORER.copy()
     capabilities['version'] = '11'
     webdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                  desired_capabilities=capabilities)
+                                                  desired_capabilities=capabilities, keep_alive=True)
 
 
 @mock.patch('toolium.config_driver.webdriver')
@@ -586,7 +626,7 @@ def test_create_remote_driver_capabilities(webdriver_mock, config, utils):
     capabilities = DesiredCapabilities.INTERNETEXPLORER.copy()
     capabilities['version'] = '11'
     webdriver_mock.Remote.assert_called_once_with(command_executor='%s/wd/hub' % server_url,
-                                                  desired_capabilities=capabilities)
+                                                  desired_capabilities=capabilities, keep_alive=True)
 
 
 def test_convert_property_type_true(config, utils):
@@ -625,6 +665,14 @@ def test_convert_property_type_list(config, utils):
     assert config_driver._convert_property_type(value) == [1, 2, 3]
 
 
+def test_convert_property_type_cached_dict_is_not_shared(config, utils):
+    config_driver = ConfigDriver(config, utils)
+    value = "{'a': [1, 2]}"
+    first_value = config_driver._convert_property_type(value)
+    first_value['a'].append(3)
+    assert config_driver._convert_property_type(value) == {'a': [1, 2]}
+
+
 @mock.patch('toolium.config_driver.webdriver')
 def test_create_firefox_profile(webdriver_mock, config, utils):
     config.add_section('Firefox')
@@ -642,6 +690,17 @@ def test_create_firefox_profile(webdriver_mock, config, utils):
     webdriver_mock.FirefoxProfile().add_extension.assert_called_once_with('resources/firebug-3.0.0-beta.3.xpi')
 
 
+@mock.patch('toolium.config_driver.webdriver')
+def test_create_firefox_profile_without_sections(webdriver_mock, config, utils):
+    config_driver = ConfigDriver(config, utils)
+
+    config_driver._create_firefox_profile()
+    webdriver_mock.FirefoxProfile.assert_called_once_with(profile_directory=None)
+    webdriver_mock.FirefoxProfile().set_preference.assert_not_called()
+    webdriver_mock.FirefoxProfile().update_preferences.assert_not_called()
+    webdriver_mock.FirefoxProfile().add_extension.assert_not_called()
+
+
 def test_add_firefox_arguments(config, utils):
     config.add_section('FirefoxArguments')
     config.set('FirefoxArguments', '-private', '')
@@ -683,3 +742,48 @@ def test_create_chrome_options_headless(webdriver_mock, config, utils):
                                                                       mock.call('--disable-gpu')])
     else:
         webdriver_mock.ChromeOptions().add_argument.assert_called_once_with('--headless')
+
+
+def test_update_dict(config, utils):
+    config_driver = ConfigDriver(config, utils)
+    initial = {'a': 1, 'b': {'c': 2, 'd': {'e': 3}}}
+    update = {'b': {'d': {'f': 4}}, 'g': 5}
+
+    merged = config_driver._update_dict(initial, update)
+    assert merged == {'a': 1, 'b': {'c': 2, 'd': {'e': 3, 'f': 4}}, 'g': 5}
+
+
+def test_update_dict_initial_key(config, utils):
+    config_driver = ConfigDriver(config, utils)
+    initial = {'a': 1, 'b': {'c': 2}}
+    update = {'a': 10, 'b': {'d': 3}}
+
+    merged = config_driver._update_dict(initial, update, initial_key='b')
+    assert merged == {'a': 1, 'b': {'c': 2, 'd': 3}}
+
+
+def test_playwright_window_position():
+    logger = mock.MagicMock()
+    assert _playwright_window_position(logger, 1040, 680) == {'width': 1040, 'height': 680}
+
+
+def test_playwright_default_timeout():
+    page = mock.MagicMock()
+    logger = mock.MagicMock()
+    _playwright_default_timeout(page, logger, 5)
+    page.set_default_timeout.assert_called_once_with(5.0)
+
+
+@mock.patch('toolium.config_driver.webdriver')
+def test_get_chrome_capabilities_cached(webdriver_mock, config, utils):
+    webdriver_mock.ChromeOptions().to_capabilities.return_value = {'goog:chromeOptions': {'args': []}}
+    webdriver_mock.ChromeOptions.reset_mock()
+
+    # A new config driver is created for each driver, but capabilities are cached in config
+    ConfigDriver(config, utils)._get_chrome_capabilities()
+    ConfigDriver(config, utils)._get_chrome_capabilities()
+    webdriver_mock.ChromeOptions.assert_called_once_with()
+
+    config.set('Driver', 'headless', 'true')
+    ConfigDriver(config, utils)._get_chrome_capabilities()
+    assert webdriver_mock.ChromeOptions.call_count == 2
@@ -19,6 +19,7 @@ limitations under the License.
 import mock
 import os
 import pytest
+from configparser import NoSectionError
 
 from toolium.config_parser import ExtendedConfigParser
 
@@ -149,6 +150,47 @@ def test_items_with_colon_in_option(config):
     assert items == config.items(section)
 
 
+def test_get_section_items(config):
+    section = 'Capabilities'
+    expected_items = dict(config.items(section))
+    assert expected_items == config.get_section_items(section)
+
+
+def test_get_section_items_modified(config):
+    section = 'Capabilities'
+    expected_items = dict(config.items(section))
+    config.get_section_items(section)['new_option'] = 'new value'
+    assert expected_items == config.get_section_items(section)
+
+
+def test_get_section_items_after_set(config):
+    section = 'Capabilities'
+    config.get_section_items(section)
+    config.set(section, 'browserName', 'chrome')
+    assert 'chrome' == config.get_section_items(section)['browserName']
+
+
+def test_get_section_items_after_remove_option(config):
+    section = 'Capabilities'
+    config.get_section_items(section)
+    config.remove_option(section, 'goog:loggingPrefs')
+    assert 'goog:loggingPrefs' not in config.get_section_items(section)
+
+
+def test_get_section_items_no_section(config):
+    with pytest.raises(NoSectionError):
+        config.get_section_items('No section')
+
+
+def test_get_cached_value(config):
+    create_value = mock.MagicMock(side_effect=['value 1', 'value 2'])
+    assert 'value 1' == config.get_cached_value('key', create_value)
+    assert 'value 1' == config.get_cached_value('key', create_value)
+    config.set('Capabilities', 'browserName', 'chrome')
+    assert 'value 2' == config.get_cached_value('key', create_value)
+    assert create_value.call_count == 2
+
+
 def test_deepcopy(config):
     section = 'AppiumCapabilities'
     option = 'automationName'
@@ -340,3 +382,9 @@ strings_to_translate = (
 @pytest.mark.parametrize("string_with_variables, translated_string", strings_to_translate)
 def test_translate_config_variables(config, string_with_variables, translated_string):
     assert translated_string == config.translate_config_variables(string_with_variables)
+
+
+def test_version_after_set(config):
+    version = config.version
+    config.set('Driver', 'type', 'chrome')
+    assert config.version > version
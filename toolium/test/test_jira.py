@@ -47,8 +47,10 @@ def logger():
     jira.fix_version = None
     jira.build = None
     jira.only_if_changes = None
+    jira.max_workers = jira.DEFAULT_MAX_WORKERS
     jira.jira_tests_status.clear()
     jira.attachments = []
+    jira.invalidate()
 
 
 def test_change_jira_status(logger):
@@ -154,6 +156,157 @@ def test_change_jira_status_exception(jira_post, logger):
     logger.warning.assert_called_once_with("Error updating Test Case '%s': %s", 'TOOLIUM-1', jira_post.side_effect)
 
 
+def test_add_jira_status_merge_attachments(logger):
+    jira.enabled = True
+    jira.attachments = ['screenshot1.png']
+    jira.add_jira_status('TOOLIUM-1', 'Pass', None)
+    jira.attachments.append('screenshot2.png')
+    jira.add_jira_status('TOOLIUM-1', 'Fail', 'comment')
+
+    expected_status = {'TOOLIUM-1': ('TOOLIUM-1', 'Fail', 'comment', ['screenshot1.png', 'screenshot2.png'])}
+    assert expected_status == jira.jira_tests_status
+
+
+@mock.patch('toolium.jira.change_jira_status')
+def test_change_all_jira_status(jira_change_status, logger):
+    jira.jira_tests_status['TOOLIUM-1'] = ('TOOLIUM-1', 'Pass', None, [])
+    jira.jira_tests_status['TOOLIUM-2'] = ('TOOLIUM-2', 'Fail', 'comment', [])
+
+    jira.change_all_jira_status()
+
+    jira_change_status.assert_has_calls([mock.call('TOOLIUM-1', 'Pass', None, [], server=None),
+                                         mock.call('TOOLIUM-2', 'Fail', 'comment', [], server=None)],
+                                        any_order=True)
+    assert jira.jira_tests_status == {}
+
+
+@mock.patch('toolium.jira.JiraServer')
+@mock.patch('toolium.jira.change_jira_status')
+def test_change_all_jira_status_shared_session(jira_change_status, jira_server, logger):
+    jira.execution_url = 'http://server/execution_service'
+    jira.jira_tests_status['TOOLIUM-1'] = ('TOOLIUM-1', 'Pass', None, [])
+    jira.jira_tests_status['TOOLIUM-2'] = ('TOOLIUM-2', 'Fail', 'comment', [])
+    server = jira_server.return_value.__enter__.return_value
+
+    jira.change_all_jira_status()
+
+    jira_server.assert_called_once_with('http://server/execution_service', None)
+    jira_change_status.assert_has_calls([mock.call('TOOLIUM-1', 'Pass', None, [], server=server),
+                                         mock.call('TOOLIUM-2', 'Fail', 'comment', [], server=server)],
+                                        any_order=True)
+
+
+@mock.patch('toolium.jira.add_results')
+def test_update_jira_issue_reuses_found_issue(jira_add_results, logger):
+    server = mock.MagicMock()
+    issue = mock.MagicMock(key='TOOLIUM-1')
+    server.search_issues.return_value = [issue]
+
+    jira.update_jira_issue(server, 'TOOLIUM-1', 'Pass', [])
+
+    server.search_issues.assert_called_once_with('issue = TOOLIUM-1')
+    server.issue.assert_not_called()
+    jira_add_results.assert_called_once_with(server, 'TOOLIUM-1', [])
+
+
+def get_attached_files(server):
+    """Get names and closed status of the files attached to the issue, sorted as they are uploaded in parallel"""
+    for args, kwargs in server.add_attachment.call_args_list:
+        assert kwargs['issue'] == 'TOOLIUM-1'
+    return sorted((kwargs['attachment'].name, kwargs['attachment'].closed)
+                  for args, kwargs in server.add_attachment.call_args_list)
+
+
+@mock.patch('toolium.jira.DriverWrappersPool')
+def test_add_results_attachments(pool, logger):
+    server = mock.MagicMock()
+    pool.screenshots_directory = 'not_existing_directory'
+    resources_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'resources')
+    attachments = [os.path.join(resources_path, 'ios.png'), os.path.join(resources_path, 'ios_web.png')]
+
+    jira.add_results(server, 'TOOLIUM-1', attachments)
+
+    assert get_attached_files(server) == [(attachments[0], True), (attachments[1], True)]
+
+
+@mock.patch('toolium.jira.DriverWrappersPool')
+def test_add_results_attachments_not_found(pool, logger):
+    server = mock.MagicMock()
+    pool.screenshots_directory = 'not_existing_directory'
+    resources_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'resources')
+    attachments = [os.path.join(resources_path, 'ios.png'), os.path.join(resources_path, 'not_found.png')]
+
+    jira.add_results(server, 'TOOLIUM-1', attachments)
+
+    assert get_attached_files(server) == [(attachments[0], True)]
+
+
+@mock.patch('toolium.jira.DriverWrappersPool')
+def test_add_results_screenshots_directory(pool, logger, tmpdir):
+    server = mock.MagicMock()
+    pool.screenshots_directory = str(tmpdir)
+    tmpdir.join('screenshot.png').write('image')
+    tmpdir.mkdir('subdirectory')
+
+    jira.add_results(server, 'TOOLIUM-1')
+
+    assert get_attached_files(server) == [(str(tmpdir.join('screenshot.png')), True)]
+
+
+def test_get_transition_id_cached(logger):
+    server = mock.MagicMock()
+    server.transitions.return_value = [{'id': '11', 'name': 'Pass'}, {'id': '21', 'name': 'Fail'}]
+
+    assert jira.get_transition_id(server, 'TOOLIUM-1', 'Open', 'pass') == 11
+    assert jira.get_transition_id(server, 'TOOLIUM-2', 'open', 'Fail') == 21
+    assert jira.get_transition_id(server, 'TOOLIUM-3', 'Open', 'Unknown') is None
+    server.transitions.assert_called_once_with('TOOLIUM-1')
+
+
+def test_get_transition_id_cached_by_current_status(logger):
+    server = mock.MagicMock()
+    server.transitions.side_effect = [[{'id': '11', 'name': 'Pass'}], [{'id': '31', 'name': 'Reopen'}]]
+
+    assert jira.get_transition_id(server, 'TOOLIUM-1', 'Open', 'Pass') == 11
+    assert jira.get_transition_id(server, 'TOOLIUM-2', 'Closed', 'Pass') is None
+    assert jira.get_transition_id(server, 'TOOLIUM-2', 'Closed', 'Reopen') == 31
+    assert server.transitions.call_args_list == [mock.call('TOOLIUM-1'), mock.call('TOOLIUM-2')]
+
+
+def test_transition_by_name_if_id_not_found(logger):
+    server = mock.MagicMock()
+    server.transitions.return_value = [{'id': '11', 'name': 'Pass'}]
+    server.transition_issue.return_value.status_code = 204
+    issue = mock.MagicMock(key='TOOLIUM-1')
+    issue.get_field.return_value = 'Open'
+
+    jira.transition(server, issue, 'Pass')
+    jira.transition(server, issue, 'Blocked')
+
+    assert server.transition_issue.call_args_list == [mock.call('TOOLIUM-1', transition=11),
+                                                      mock.call('TOOLIUM-1', transition='blocked')]
+
+
+def test_get_error_message_apache(logger):
+    response_content = '<html><body><p><u>Test Case not found</u></p><p>description</p></body></html>'
+    assert 'Test Case not found' == jira.get_error_message(response_content)
+
+
+def test_get_error_message_local(logger):
+    response_content = '<html><head><title>404 Not Found</title></head><body></body></html>'
+    assert '404 Not Found' == jira.get_error_message(response_content)
+
+
+def test_get_error_message_unknown(logger):
+    response_content = 'Unknown error'
+    assert 'Unknown error' == jira.get_error_message(response_content)
+
+
+def test_get_error_message_unclosed_tag(logger):
+    response_content = '<html><head><title>404 Not Found'
+    assert response_content == jira.get_error_message(response_content)
+
+
 def test_jira_annotation_pass(logger):
     # Configure jira module
     config = DriverWrappersPool.get_default_wrapper().config
@@ -228,6 +381,72 @@ def test_jira_disabled(logger):
     assert expected_status == jira.jira_tests_status
 
 
+@mock.patch('toolium.jira.DriverWrappersPool')
+def test_save_jira_conf_read_once(pool, logger):
+    config = pool.get_default_wrapper.return_value.config
+    config.version = 1
+    config.get_optional.side_effect = lambda section, option, default=None: default
+
+    jira.save_jira_conf()
+    jira.attachments.append('screenshot.png')
+    jira.save_jira_conf()
+
+    assert config.getboolean_optional.call_count == 2
+    assert jira.attachments == []
+
+    config.version = 2
+    jira.save_jira_conf()
+    assert config.getboolean_optional.call_count == 4
+
+    jira.reload_jira_conf()
+    assert config.getboolean_optional.call_count == 6
+
+
+@mock.patch('toolium.jira.logger')
+@mock.patch('toolium.jira.DriverWrappersPool')
+def test_save_jira_conf_invalid_max_workers(pool, jira_logger, logger):
+    config = pool.get_default_wrapper.return_value.config
+    config.get_optional.side_effect = lambda section, option, default=None: '0' if option == 'max_workers' else default
+
+    jira.save_jira_conf()
+
+    assert jira.max_workers == jira.DEFAULT_MAX_WORKERS
+    jira_logger.warning.assert_called_once_with("Invalid Jira max_workers value %s, using %s", 0,
+                                                jira.DEFAULT_MAX_WORKERS)
+
+
+@pytest.mark.parametrize("max_workers, attachment_workers", [
+    (1, 4),
+    (5, 2),
+    (20, 1),
+])
+def test_get_attachment_workers(max_workers, attachment_workers, logger):
+    jira.max_workers = max_workers
+    assert jira.get_attachment_workers() == attachment_workers
+
+
+@mock.patch('toolium.jira.DriverWrappersPool')
+def test_jira_disabled_reads_configuration_once(pool, logger):
+    config = pool.get_default_wrapper.return_value.config
+    config.version = 1
+    config.getboolean_optional.return_value = False
+    config.get_optional.side_effect = lambda section, option, default=None: default
+
+    MockTestClass().mock_test_pass()
+    MockTestClass().mock_test_pass_2()
+
+    assert config.getboolean_optional.call_count == 2
+    assert {} == jira.jira_tests_status
+
+    # New configuration object is read again
+    pool.get_default_wrapper.return_value.config = new_config = mock.MagicMock(version=1)
+    new_config.getboolean_optional.return_value = False
+    new_config.get_optional.side_effect = lambda section, option, default=None: default
+    MockTestClass().mock_test_pass()
+
+    assert new_config.getboolean_optional.call_count == 2
+
+
 class MockTestClass():
     def get_method_name(self):
         return 'test name'
@@ -133,6 +133,20 @@ def test_compare_files_equal(driver_wrapper):
     assert message is None
 
 
+def test_compare_files_equal_skip_engine(driver_wrapper):
+    visual = VisualTest(driver_wrapper)
+    visual.engine = mock.MagicMock(spec=PilEngine)
+    message = visual.compare_files('report_name', file_v1, file_v1, 0)
+    assert message is None
+    visual.engine.assertSameFiles.assert_not_called()
+
+
+def test_same_pixels(driver_wrapper):
+    assert VisualTest._same_pixels(file_v1, file_v1) is True
+    assert VisualTest._same_pixels(file_v1, file_v2) is False
+    assert VisualTest._same_pixels(file_v1, file_small) is False
+
+
 def test_compare_files_diff(driver_wrapper):
     visual = VisualTest(driver_wrapper)
     message = visual.compare_files('report_name', file_v1, file_v2, 0)
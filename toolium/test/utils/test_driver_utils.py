@@ -61,6 +61,7 @@ def get_mock_element(x, y, height, width):
     mock_element = mock.MagicMock(spec=WebElement)
     mock_element.location = {'x': x, 'y': y}
     mock_element.size = {'height': height, 'width': width}
+    mock_element.rect = {'x': x, 'y': y, 'height': height, 'width': width}
     return mock_element
 
 
@@ -554,6 +555,15 @@ def test_swipe_web(driver_wrapper, utils):
     assert 'Swipe method is not implemented in Selenium' == str(excinfo.value)
 
 
+def test_get_location_and_size(utils):
+    element = get_mock_element(x=250.4, y=40.6, height=40.5, width=300)
+
+    location, size = utils.get_location_and_size(element)
+
+    assert location == {'x': 250, 'y': 41}
+    assert size == {'height': 40.5, 'width': 300}
+
+
 def test_get_web_element_from_web_element(utils):
     element = WebElement(None, 1)
     web_element = utils.get_web_element(element)
@@ -592,6 +602,22 @@ def test_get_web_element_from_unknown(utils):
     assert web_element is None
 
 
+def test_wait_until_element_visible_replaced_element(driver_wrapper, utils):
+    # Configure driver mock
+    hidden_element = mock.MagicMock(spec=WebElement)
+    hidden_element.is_displayed.return_value = False
+    web_element = mock.MagicMock(spec=WebElement)
+    web_element.is_displayed.return_value = True
+    driver_wrapper.driver.find_element.side_effect = [hidden_element, web_element]
+    element_locator = (By.ID, 'element_id')
+
+    element = utils.wait_until_element_visible(element_locator)
+
+    # Element is searched again in each iteration, as it could have been replaced in the page
+    assert element == web_element
+    assert driver_wrapper.driver.find_element.call_count == 2
+
+
 def test_wait_until_first_element_is_found_locator(driver_wrapper, utils):
     # Configure driver mock
     driver_wrapper.driver.find_element.return_value = 'mock_element'
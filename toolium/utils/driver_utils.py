@@ -282,10 +282,19 @@ class Utils(WaitUtils):
         :returns: dict with center coordinates
         """
         web_element = self.get_web_element(element)
-        location = web_element.location
-        size = web_element.size
+        location, size = self.get_location_and_size(web_element)
         return {'x': location['x'] + (size['width'] / 2), 'y': location['y'] + (size['height'] / 2)}
 
+    @staticmethod
+    def get_location_and_size(web_element):
+        """Get location and size of an element, using a single request in W3C drivers instead of one for each value
+
+        :param web_element: WebElement object
+        :returns: tuple with location dict (x, y) and size dict (height, width), as location and size properties
+        """
+        rect = web_element.rect
+        return {'x': round(rect['x']), 'y': round(rect['y'])}, {'height': rect['height'], 'width': rect['width']}
+
     def get_safari_navigation_bar_height(self):
         """Get the height of Safari navigation bar
 
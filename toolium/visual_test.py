@@ -32,7 +32,7 @@ from toolium.utils.path_utils import get_valid_filename, makedirs_safe
 try:
     from needle.engines.perceptualdiff_engine import Engine as PerceptualEngine
     from needle.engines.pil_engine import Engine as PilEngine
-    from PIL import Image
+    from PIL import Image, ImageChops
     from needle.engines.imagemagick_engine import Engine as MagickEngine
 except ImportError:
     pass
@@ -269,8 +269,7 @@ class VisualTest(object):
             offset_x = 0
             offset_y = self.utils.get_safari_navigation_bar_height()
 
-        location = web_element.location
-        size = web_element.size
+        location, size = self.utils.get_location_and_size(web_element)
         return (int(location['x']) + offset_x, int(location['y'] + offset_y),
                 int(location['x'] + offset_x + size['width']), int(location['y'] + offset_y + size['height']))
 
@@ -321,6 +320,11 @@ class VisualTest(object):
         :returns: error message
         """
         width, height = Image.open(image_file).size
+        if self._same_pixels(image_file, baseline_file):
+            # Identical images pass with any threshold, so the engine comparison is skipped
+            if self.driver_wrapper.config.getboolean_optional('VisualTests', 'complete_report'):
+                self._add_result_to_report('equal', report_name, image_file, baseline_file)
+            return None
         if isinstance(self.engine, PilEngine):
             # Pil needs a pixel number threshold instead of a percentage threshold
             threshold = int(width * height * threshold)
@@ -328,7 +332,7 @@ class VisualTest(object):
             if 'MagickEngine' in globals() and isinstance(self.engine, MagickEngine):
                 # Workaround: ImageMagick hangs when images are not equal
                 assert (width, height) == Image.open(baseline_file).size, 'Image dimensions do not match'
-            self.engine.assertSameFiles(image_file, baseline_file, threshold)
+            self._assert_same_files(image_file, baseline_file, threshold)
             if self.driver_wrapper.config.getboolean_optional('VisualTests', 'complete_report'):
                 self._add_result_to_report('equal', report_name, image_file, baseline_file)
             return None
@@ -342,6 +346,41 @@ class VisualTest(object):
             else:
                 return diff_message
 
+    def _assert_same_files(self, image_file, baseline_file, threshold):
+        """Assert that two image files are equal within a threshold using the configured engine
+        PIL engine distance is calculated with PIL image operations instead of iterating over the pixels in Python
+
+        :param image_file: image file path
+        :param baseline_file: baseline image file path
+        :param threshold: engine threshold
+        """
+        if not isinstance(self.engine, PilEngine):
+            self.engine.assertSameFiles(image_file, baseline_file, threshold)
+            return
+
+        image = Image.open(image_file).convert('RGB')
+        baseline = Image.open(baseline_file).convert('RGB')
+        if image.size != baseline.size:
+            raise AssertionError()
+        # Same distance as needle PIL engine: sum of absolute differences of all bands, divided by bands and 255
+        histogram = ImageChops.difference(image, baseline).histogram()
+        distance = sum((value % 256) * count for value, count in enumerate(histogram)) / (3 * 255)
+        if distance > threshold:
+            raise AssertionError("The new screenshot '%s' did not match the baseline '%s' (by a distance of %.2f)"
+                                 % (image_file, baseline_file, distance))
+
+    @staticmethod
+    def _same_pixels(image_file, baseline_file):
+        """Check if two image files have exactly the same pixels, comparing their raw data instead of pixel by pixel
+
+        :param image_file: image file path
+        :param baseline_file: baseline image file path
+        :returns: True if both images have the same mode, size and pixels
+        """
+        with Image.open(image_file) as image, Image.open(baseline_file) as baseline:
+            return image.mode == baseline.mode and image.size == baseline.size and \
+                image.tobytes() == baseline.tobytes()
+
     def _add_result_to_report(self, result, report_name, image_file, baseline_file, message=''):
         """Add the result of a visual test to the html report
 